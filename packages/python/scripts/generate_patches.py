@@ -12,6 +12,7 @@ import argparse
 import math
 import sys
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 from epaper_dithering import ColorScheme
@@ -39,12 +40,15 @@ def generate_patches(scheme: ColorScheme, width: int, height: int) -> Image.Imag
     img = Image.new("RGB", (width, height), (0, 0, 0))
     draw = ImageDraw.Draw(img)
 
-    for i, (name, rgb) in enumerate(colors):
+    # Label brightness for all patches at once (ITU-R BT.601 luma)
+    rgbs = np.array([rgb for _, rgb in colors], dtype=np.float32)
+    brights = rgbs @ np.array([0.299, 0.587, 0.114], dtype=np.float32) > 128
+
+    for i, ((name, rgb), bright) in enumerate(zip(colors, brights)):
         x = (i % best_cols) * cell_w
         y = (i // best_cols) * cell_h
         draw.rectangle([x, y, x + cell_w, y + cell_h], fill=rgb)
 
-        bright = (0.299 * rgb[0] + 0.587 * rgb[1] + 0.114 * rgb[2]) > 128
         draw.text(
             (x + cell_w // 2, y + cell_h - font.size),
             name.upper(), fill=(0, 0, 0) if bright else (255, 255, 255),
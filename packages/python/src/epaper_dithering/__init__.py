@@ -4,7 +4,8 @@ A standalone library providing multiple dithering algorithms optimized
 for limited-color e-paper/e-ink displays.
 """
 
-from .core import dither_image
+from .batch import BatchDitherer
+from .core import dither_image, dither_image_array, precompile
 from .enums import DitherMode
 from .palettes import (
     BWRY_4_2,
@@ -21,6 +22,9 @@ __version__ = "0.6.0"
 
 __all__ = [
     "dither_image",
+    "dither_image_array",
+    "precompile",
+    "BatchDitherer",
     "DitherMode",
     "ColorPalette",
     "ColorScheme",
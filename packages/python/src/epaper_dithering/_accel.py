@@ -0,0 +1,566 @@
+"""Optional Numba-accelerated kernels for the hot dithering loops.
+
+Error diffusion processes H×W pixels one at a time, which is compute-bound
+and stuck at interpreter speed in pure Python. When numba is installed
+(``pip install epaper-dithering[speed]``), the per-pixel loop is JIT-compiled
+to native code for a 30-100× speedup. Without numba, callers fall back to
+the pure-Python implementations in :mod:`algorithms`.
+
+The kernels mirror the scalar color science in :mod:`color_space_lab`
+(inline RGB→LAB conversion and LCH-weighted matching) because jitted code
+cannot call back into regular Python functions.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+
+from .color_space_lab import _EPSILON, _KAPPA, _WC, _WH, _WL, _XN, _YN, _ZN, rgb_to_lab
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without the extra
+    NUMBA_AVAILABLE = False
+
+
+# Lazily built linear RGB -> LAB lookup table for the error diffusion match
+# path: 64 steps per channel, shape (64, 64, 64, 4) float32 with columns
+# [L, a, b, C]. Replaces three cube roots and a matrix multiply per pixel
+# with one gather. 64 steps per linear channel is well below the ~0.5 JND
+# granularity of LAB for nearest-of-N palette decisions; the error term
+# itself stays exact, so no brightness drift is introduced.
+_LAB_LUT: np.ndarray | None = None
+
+
+def get_lab_lut() -> np.ndarray:
+    """Build (once) and return the quantized linear RGB -> LAB table."""
+    global _LAB_LUT
+    if _LAB_LUT is None:
+        steps = np.linspace(0.0, 1.0, 64)
+        grid = np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), axis=-1)
+        lab = rgb_to_lab(grid)
+        lut = np.empty((64, 64, 64, 4), dtype=np.float32)
+        lut[..., :3] = lab
+        lut[..., 3] = np.sqrt(lab[..., 1] ** 2 + lab[..., 2] ** 2)
+        _LAB_LUT = lut
+    return _LAB_LUT
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def _lab_f(t: float) -> float:
+        """CIE LAB nonlinear function (jitted scalar version)."""
+        if t > _EPSILON:
+            return t ** (1.0 / 3.0)  # type: ignore[no-any-return]
+        return (_KAPPA * t + 16.0) / 116.0
+
+    @njit(cache=True, fastmath=True)
+    def _match_pixel_lch(
+        r: float, g: float, b: float,
+        palette_lab: np.ndarray,
+    ) -> int:
+        """Find closest palette color using LCH-weighted LAB distance.
+
+        Jitted twin of color_space_lab._match_pixel_lch. palette_lab is the
+        packed (N, 4) float32 [L, a, b, C] array from precompute_palette_lab,
+        kept contiguous so LLVM can vectorize the distance loop.
+        """
+        # RGB -> XYZ (inline matrix multiply)
+        x = 0.4124564 * r + 0.3575761 * g + 0.1804375 * b
+        y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
+        z = 0.0193339 * r + 0.1191920 * g + 0.9503041 * b
+
+        fx = _lab_f(x / _XN)
+        fy = _lab_f(y / _YN)
+        fz = _lab_f(z / _ZN)
+
+        pL = 116.0 * fy - 16.0
+        pa = 500.0 * (fx - fy)
+        pb = 200.0 * (fy - fz)
+        pC = np.sqrt(pa * pa + pb * pb)
+
+        best_idx = 0
+        best_dist = np.inf
+
+        for i in range(palette_lab.shape[0]):
+            dL = pL - palette_lab[i, 0]
+            da = pa - palette_lab[i, 1]
+            db = pb - palette_lab[i, 2]
+            dC = pC - palette_lab[i, 3]
+            dH_sq = da * da + db * db - dC * dC
+            if dH_sq < 0.0:
+                dH_sq = 0.0
+
+            dist = (_WL * dL) ** 2 + (_WC * dC) ** 2 + _WH * _WH * dH_sq
+            if dist < best_dist:
+                best_dist = dist
+                best_idx = i
+
+        return best_idx
+
+    @njit(fastmath=True)
+    def _match_pixel_lch_lut(
+        r: float, g: float, b: float,
+        lab_lut: np.ndarray,
+        palette_lab: np.ndarray,
+    ) -> int:
+        """LUT-based variant of _match_pixel_lch for the error diffusion path.
+
+        Reads the pixel's LAB coordinates from the quantized 64^3 table
+        (see get_lab_lut) instead of converting analytically, then runs the
+        same LCH-weighted argmin over the packed palette.
+        """
+        ri = int(r * 63.0 + 0.5)
+        gi = int(g * 63.0 + 0.5)
+        bi = int(b * 63.0 + 0.5)
+
+        pL = lab_lut[ri, gi, bi, 0]
+        pa = lab_lut[ri, gi, bi, 1]
+        pb = lab_lut[ri, gi, bi, 2]
+        pC = lab_lut[ri, gi, bi, 3]
+
+        best_idx = 0
+        best_dist = np.inf
+
+        for i in range(palette_lab.shape[0]):
+            dL = pL - palette_lab[i, 0]
+            da = pa - palette_lab[i, 1]
+            db = pb - palette_lab[i, 2]
+            dC = pC - palette_lab[i, 3]
+            dH_sq = da * da + db * db - dC * dC
+            if dH_sq < 0.0:
+                dH_sq = 0.0
+
+            dist = (_WL * dL) ** 2 + (_WC * dC) ** 2 + _WH * _WH * dH_sq
+            if dist < best_dist:
+                best_dist = dist
+                best_idx = i
+
+        return best_idx
+
+    # One compiled specialization per error diffusion kernel, keyed by
+    # kernel name. Baking the offsets in as closure constants lets LLVM
+    # fully unroll the distribution loop (generated_jit is gone from
+    # modern numba; a closure factory is the supported equivalent).
+    # Signature: (pixels_linear, lab_lut, palette_lab, palette_rgb,
+    # serpentine) -> (H, W) uint8 index array
+    _ErrorDiffusionLoop = Callable[
+        [np.ndarray, np.ndarray, np.ndarray, np.ndarray, bool], np.ndarray
+    ]
+    _SERIAL_LOOPS: dict[str, _ErrorDiffusionLoop] = {}
+
+    def get_error_diffusion_loop(
+        name: str,
+        offsets: tuple[tuple[int, int, float], ...],
+    ) -> _ErrorDiffusionLoop:
+        """Get (compiling on first use) the jitted loop for one kernel.
+
+        Args:
+            name: Kernel name, the specialization cache key
+            offsets: (dx, dy, normalized_weight) tuples with weights
+                already divided by the kernel divisor
+
+        Returns:
+            Jitted function (pixels_linear, palette_lab, palette_rgb,
+            serpentine) -> (H, W) uint8 index array
+        """
+        loop = _SERIAL_LOOPS.get(name)
+        if loop is not None:
+            return loop
+
+        # Closure constants: numba freezes these, so the offset loop has a
+        # compile-time trip count and constant dx/dy/weight per iteration
+        offsets_dx = tuple(dx for dx, _, _ in offsets)
+        offsets_dx_rl = tuple(-dx for dx, _, _ in offsets)
+        offsets_dy = tuple(dy for _, dy, _ in offsets)
+        offsets_w = tuple(w for _, _, w in offsets)
+        n_offsets = len(offsets)
+        # Horizontal kernel reach; the error rows are padded by this much
+        # on both sides so neighbor writes need no bounds checks
+        margin = max(abs(dx) for dx, _, _ in offsets)
+
+        @njit(fastmath=True)
+        def error_diffusion_loop(
+            pixels_linear: np.ndarray,
+            lab_lut: np.ndarray,
+            palette_lab: np.ndarray,
+            palette_rgb: np.ndarray,
+            serpentine: bool,
+        ) -> np.ndarray:
+            """Run the full error diffusion scan, returning palette indices.
+
+            Error accumulation uses three rolling row buffers instead of
+            writing into the full image: kernels only ever reach rows
+            y..y+2, so the active error state is 3 rows that stay hot in
+            L1 rather than image-sized strided writes to DRAM.
+            """
+            height, width = pixels_linear.shape[:2]
+            output_pixels = np.zeros((height, width), dtype=np.uint8)
+
+            # Rolling error buffers for rows y, y+1, y+2, indexed by
+            # row % 3. float32 keeps all three rows L1/L2-resident even
+            # for very wide images. Columns are padded by the kernel
+            # reach on both sides: out-of-image error lands in the
+            # margins (never read, cleared with the row) so the neighbor
+            # store loop carries no bounds branches at all. Vertical
+            # overshoot is equally harmless — on the last rows, writes
+            # roll into buffers for rows past the image that are never
+            # consumed.
+            err_rows = np.zeros((3, width + 2 * margin, 3), dtype=np.float32)
+
+            # Last-pixel memo: constant-color runs (UI mockups, diagrams)
+            # reuse the previous match instead of re-running the search
+            prev_r = -1.0
+            prev_g = -1.0
+            prev_b = -1.0
+            prev_idx = 0
+
+            for y in range(height):
+                # Serpentine scanning: alternate direction each row
+                reverse = serpentine and (y & 1) == 1
+                dxs = offsets_dx_rl if reverse else offsets_dx
+                row = y % 3
+
+                for step in range(width):
+                    x = width - 1 - step if reverse else step
+
+                    xm = x + margin
+
+                    # Read current pixel plus accumulated error (clamped to valid range)
+                    r = min(1.0, max(0.0, pixels_linear[y, x, 0] + err_rows[row, xm, 0]))
+                    g = min(1.0, max(0.0, pixels_linear[y, x, 1] + err_rows[row, xm, 1]))
+                    b = min(1.0, max(0.0, pixels_linear[y, x, 2] + err_rows[row, xm, 2]))
+
+                    if abs(r - prev_r) + abs(g - prev_g) + abs(b - prev_b) < 1e-4:
+                        new_idx = prev_idx
+                    else:
+                        new_idx = _match_pixel_lch_lut(r, g, b, lab_lut, palette_lab)
+                        prev_r = r
+                        prev_g = g
+                        prev_b = b
+                        prev_idx = new_idx
+                    output_pixels[y, x] = new_idx
+
+                    err_r = r - palette_rgb[new_idx, 0]
+                    err_g = g - palette_rgb[new_idx, 1]
+                    err_b = b - palette_rgb[new_idx, 2]
+
+                    for i in range(n_offsets):
+                        nx = xm + dxs[i]
+                        nrow = (y + offsets_dy[i]) % 3
+                        nw = offsets_w[i]
+                        err_rows[nrow, nx, 0] += err_r * nw
+                        err_rows[nrow, nx, 1] += err_g * nw
+                        err_rows[nrow, nx, 2] += err_b * nw
+
+                # This row's buffer becomes row y+3's: reset it for reuse
+                err_rows[row, :, :] = 0.0
+
+            return output_pixels
+
+        # Return via the typed table so mypy sees _ErrorDiffusionLoop
+        # rather than the Any the njit decorator leaves behind
+        _SERIAL_LOOPS[name] = error_diffusion_loop
+        return _SERIAL_LOOPS[name]
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def ordered_dither_kernel(
+        pixels_linear: np.ndarray,
+        bayer: np.ndarray,
+        palette_lab: np.ndarray,
+    ) -> np.ndarray:
+        """Fused Bayer threshold + clamp + palette match in one pass.
+
+        The numpy path builds a full (H, W) threshold matrix, an (H, W, 3)
+        thresholded copy, and the distance temporaries of the batch matcher —
+        several image-sized float32 buffers for a memory-bound op. This
+        kernel reads each pixel once, applies the Bayer offset and clamp as
+        scalars, matches inline, and writes a single uint8.
+
+        Args:
+            pixels_linear: Image in linear RGB, shape (H, W, 3). Not modified.
+            bayer: Normalized 4x4 Bayer matrix, values in [-0.5, 0.5]
+            palette_lab: Packed palette LAB, shape (N, 4), columns [L, a, b, C]
+
+        Returns:
+            Palette index array, shape (H, W), dtype uint8
+        """
+        height, width = pixels_linear.shape[:2]
+        output_pixels = np.zeros((height, width), dtype=np.uint8)
+
+        for y in prange(height):  # type: ignore[no-untyped-call, attr-defined]
+            for x in range(width):
+                threshold = bayer[y & 3, x & 3]
+
+                r = min(1.0, max(0.0, pixels_linear[y, x, 0] + threshold))
+                g = min(1.0, max(0.0, pixels_linear[y, x, 1] + threshold))
+                b = min(1.0, max(0.0, pixels_linear[y, x, 2] + threshold))
+
+                output_pixels[y, x] = _match_pixel_lch(r, g, b, palette_lab)
+
+        return output_pixels
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def ordered_dither_kernel_srgb(
+        pixels_srgb: np.ndarray,
+        srgb_lut: np.ndarray,
+        bayer: np.ndarray,
+        palette_lab: np.ndarray,
+    ) -> np.ndarray:
+        """ordered_dither_kernel fused one stage further back, from uint8.
+
+        Folds the sRGB -> linear gamma decode (three 256-entry LUT reads)
+        into the same pass, so the (H, W, 3) float32 linear intermediate is
+        never materialized at all: uint8 in, palette indices out. Used when
+        no tone compression runs between decode and match.
+
+        Args:
+            pixels_srgb: Image in sRGB, shape (H, W, 3), dtype uint8
+            srgb_lut: 256-entry sRGB -> linear float32 table
+            bayer: Normalized 4x4 Bayer matrix, values in [-0.5, 0.5]
+            palette_lab: Packed palette LAB, shape (N, 4), columns [L, a, b, C]
+
+        Returns:
+            Palette index array, shape (H, W), dtype uint8
+        """
+        height, width = pixels_srgb.shape[:2]
+        output_pixels = np.zeros((height, width), dtype=np.uint8)
+
+        for y in prange(height):  # type: ignore[no-untyped-call, attr-defined]
+            for x in range(width):
+                threshold = bayer[y & 3, x & 3]
+
+                r = min(1.0, max(0.0, srgb_lut[pixels_srgb[y, x, 0]] + threshold))
+                g = min(1.0, max(0.0, srgb_lut[pixels_srgb[y, x, 1]] + threshold))
+                b = min(1.0, max(0.0, srgb_lut[pixels_srgb[y, x, 2]] + threshold))
+
+                output_pixels[y, x] = _match_pixel_lch(r, g, b, palette_lab)
+
+        return output_pixels
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def match_image_lch(
+        pixels_linear: np.ndarray,
+        palette_lab: np.ndarray,
+    ) -> np.ndarray:
+        """Match every pixel to its closest palette color, rows in parallel.
+
+        Jitted twin of color_space_lab.find_closest_palette_color_lab for
+        full images: no inter-pixel dependency, so rows split across cores
+        via prange, and the inline scalar match avoids the batch matcher's
+        chunk temporaries entirely. Used by direct palette mapping when the
+        tone-compressed path cannot go through the uint8 index LUT.
+
+        Args:
+            pixels_linear: Image in linear RGB, shape (H, W, 3). Not modified.
+            palette_lab: Packed palette LAB, shape (N, 4), columns [L, a, b, C]
+
+        Returns:
+            Palette index array, shape (H, W), dtype uint8
+        """
+        height, width = pixels_linear.shape[:2]
+        output_pixels = np.zeros((height, width), dtype=np.uint8)
+
+        for y in prange(height):  # type: ignore[no-untyped-call, attr-defined]
+            for x in range(width):
+                output_pixels[y, x] = _match_pixel_lch(
+                    pixels_linear[y, x, 0],
+                    pixels_linear[y, x, 1],
+                    pixels_linear[y, x, 2],
+                    palette_lab,
+                )
+
+        return output_pixels
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def tone_compress_kernel(
+        pixels_linear: np.ndarray,
+        result: np.ndarray,
+        black_Y: float,
+        display_range: float,
+        y_offset: float,
+        inv_y_range: float,
+        strength: float,
+        black_level: float,
+    ) -> np.ndarray:
+        """Fused dynamic range compression: one read, one write per pixel.
+
+        The numpy implementation in tone_map materializes luminance, target,
+        scale, and mask arrays — half a dozen image-sized temporaries for a
+        memory-bound remap. This kernel computes luminance, the remapped
+        target, the hue-preserving scale, and the clamp in registers and
+        streams the result out in a single parallel pass.
+
+        Parameterized to cover both entry points: fixed-strength
+        compression uses y_offset=0, inv_y_range=1; auto compression maps
+        the percentile window via y_offset=p_low, inv_y_range=1/image_range
+        with strength=1. Luminance uses the same BT.709 coefficients as
+        tone_map.
+
+        Args:
+            pixels_linear: Image in linear RGB, shape (H, W, 3)
+            result: Output buffer, same shape and dtype as pixels_linear.
+                May alias pixels_linear for in-place compression (each
+                pixel is read fully before it is written).
+            black_Y: Display black luminance
+            display_range: white_Y - black_Y
+            y_offset: Luminance subtracted before remapping
+            inv_y_range: Reciprocal of the input luminance range
+            strength: Blend between original and compressed luminance
+            black_level: Output level for near-black pixels (Y <= 1e-6)
+
+        Returns:
+            The result buffer
+        """
+        height, width = pixels_linear.shape[:2]
+
+        for y in prange(height):  # type: ignore[no-untyped-call, attr-defined]
+            for x in range(width):
+                r = pixels_linear[y, x, 0]
+                g = pixels_linear[y, x, 1]
+                b = pixels_linear[y, x, 2]
+                Y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
+
+                if Y > 1e-6:
+                    compressed = black_Y + (Y - y_offset) * inv_y_range * display_range
+                    target = Y + strength * (compressed - Y)
+                    scale = target / Y
+                    result[y, x, 0] = min(1.0, max(0.0, r * scale))
+                    result[y, x, 1] = min(1.0, max(0.0, g * scale))
+                    result[y, x, 2] = min(1.0, max(0.0, b * scale))
+                else:
+                    result[y, x, 0] = black_level
+                    result[y, x, 1] = black_level
+                    result[y, x, 2] = black_level
+
+        return result
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def srgb_tone_compress_kernel(
+        pixels_srgb: np.ndarray,
+        srgb_lut: np.ndarray,
+        result: np.ndarray,
+        black_Y: float,
+        display_range: float,
+        strength: float,
+        black_level: float,
+    ) -> np.ndarray:
+        """Fused uint8 gamma decode + fixed-strength tone compression.
+
+        Same remap as tone_compress_kernel, but reading uint8 sRGB and
+        linearizing through the 256-entry LUT inline, so the linear
+        intermediate is never materialized: the pipeline's first two
+        full-image passes collapse into one read of the uint8 buffer and
+        one write of the compressed float32 buffer. Fixed strength only —
+        the auto path needs image-wide luminance statistics before it can
+        remap, so it decodes first.
+
+        Args:
+            pixels_srgb: Image in sRGB, shape (H, W, 3), dtype uint8
+            srgb_lut: 256-entry sRGB -> linear float32 table
+            result: float32 output buffer, shape (H, W, 3)
+            black_Y: Display black luminance
+            display_range: white_Y - black_Y
+            strength: Blend between original and compressed luminance
+            black_level: Output level for near-black pixels (Y <= 1e-6)
+
+        Returns:
+            The result buffer
+        """
+        height, width = pixels_srgb.shape[:2]
+
+        for y in prange(height):  # type: ignore[no-untyped-call, attr-defined]
+            for x in range(width):
+                r = srgb_lut[pixels_srgb[y, x, 0]]
+                g = srgb_lut[pixels_srgb[y, x, 1]]
+                b = srgb_lut[pixels_srgb[y, x, 2]]
+                Y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
+
+                if Y > 1e-6:
+                    compressed = black_Y + Y * display_range
+                    target = Y + strength * (compressed - Y)
+                    scale = target / Y
+                    result[y, x, 0] = min(1.0, max(0.0, r * scale))
+                    result[y, x, 1] = min(1.0, max(0.0, g * scale))
+                    result[y, x, 2] = min(1.0, max(0.0, b * scale))
+                else:
+                    result[y, x, 0] = black_level
+                    result[y, x, 1] = black_level
+                    result[y, x, 2] = black_level
+
+        return result
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def error_diffusion_wavefront(
+        pixels_linear: np.ndarray,
+        lab_lut: np.ndarray,
+        palette_lab: np.ndarray,
+        palette_rgb: np.ndarray,
+        offsets_dx: np.ndarray,
+        offsets_dy: np.ndarray,
+        offsets_w: np.ndarray,
+        skew: int,
+    ) -> np.ndarray:
+        """Parallel raster-scan error diffusion via a skewed wavefront sweep.
+
+        Error diffusion looks inherently sequential, but pixels on the same
+        skewed anti-diagonal ``d = x + skew * y`` are mutually independent
+        when the skew exceeds the kernel reach. With ``skew = 2 * radius + 1``
+        (radius = max |dx| of the kernel):
+
+        - every pixel that diffuses error INTO (x, y) lies on an earlier
+          wavefront (dx + skew * dy > 0 for all forward kernel offsets), and
+        - no two pixels on the same wavefront write the same neighbor
+          (their x distance, a multiple of skew, exceeds 2 * radius).
+
+        Wavefronts are processed serially; pixels within one wavefront run in
+        numba prange. Only valid for raster scanning — serpentine rows scan in
+        opposite directions, so each row depends on the full previous row and
+        no wavefront parallelism exists.
+
+        Args match error_diffusion_loop, plus:
+            skew: Wavefront slope, 2 * kernel radius + 1
+
+        Returns:
+            Palette index array, shape (H, W), dtype uint8
+        """
+        height, width = pixels_linear.shape[:2]
+        output_pixels = np.zeros((height, width), dtype=np.uint8)
+        n_offsets = offsets_dx.shape[0]
+
+        n_wavefronts = width + skew * (height - 1)
+        for d in range(n_wavefronts):
+            # Valid rows on this wavefront: x = d - skew*y must be in [0, width)
+            y_min = max(0, (d - width + skew) // skew)  # ceil((d - width + 1) / skew)
+            y_max = min(height - 1, d // skew)
+
+            for y in prange(y_min, y_max + 1):  # type: ignore[no-untyped-call, attr-defined]
+                x = d - skew * y
+
+                r = min(1.0, max(0.0, pixels_linear[y, x, 0]))
+                g = min(1.0, max(0.0, pixels_linear[y, x, 1]))
+                b = min(1.0, max(0.0, pixels_linear[y, x, 2]))
+
+                new_idx = _match_pixel_lch_lut(r, g, b, lab_lut, palette_lab)
+                output_pixels[y, x] = new_idx
+
+                err_r = r - palette_rgb[new_idx, 0]
+                err_g = g - palette_rgb[new_idx, 1]
+                err_b = b - palette_rgb[new_idx, 2]
+
+                for i in range(n_offsets):
+                    nx = x + offsets_dx[i]
+                    ny = y + offsets_dy[i]
+
+                    if 0 <= nx < width and 0 <= ny < height:
+                        nw = offsets_w[i]
+                        pixels_linear[ny, nx, 0] += err_r * nw
+                        pixels_linear[ny, nx, 1] += err_g * nw
+                        pixels_linear[ny, nx, 2] += err_b * nw
+
+        return output_pixels
@@ -3,18 +3,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 import numpy as np
 from PIL import Image
 
-from .color_space import srgb_to_linear
+from . import _accel
+from .color_space import _SRGB_TO_LINEAR_LUT, srgb_to_linear
 from .color_space_lab import (
     _match_pixel_lch,
     find_closest_palette_color_lab,
     precompute_palette_lab,
 )
 from .palettes import ColorPalette, ColorScheme
-from .tone_map import auto_compress_dynamic_range, compress_dynamic_range
+from .tone_map import auto_compress_dynamic_range, compress_dynamic_range_srgb
 
 
 @dataclass(frozen=True)
@@ -121,115 +123,150 @@ _BAYER_4X4 = (
 )
 
 
-def get_palette_colors(color_scheme: ColorScheme | ColorPalette) -> list[tuple[int, int, int]]:
-    """Get RGB palette for color scheme or custom palette.
+@dataclass(frozen=True, eq=False)
+class _PaletteData:
+    """Precomputed per-palette data shared across dither calls.
 
-    Args:
-        color_scheme: Display color scheme enum OR custom ColorPalette
+    Palettes are immutable (enum members or frozen ColorPalette), so all
+    derived representations can be computed once and cached.
 
-    Returns:
-        List of RGB tuples for palette (order matters for encoding)
+    Attributes:
+        srgb: Palette colors as RGB tuples (order matters for encoding)
+        linear: Palette in linear RGB, shape (N, 3), float32
+        linear_f64: Same in float64, for the jitted error diffusion kernel
+        lab: Packed palette LAB, shape (N, 4) float32, columns [L, a, b, C]
+        rgb: Palette linear RGB as Python float triples (fallback loop)
+        flat_palette: Flattened sRGB list for Image.putpalette()
     """
-    if isinstance(color_scheme, ColorScheme):
-        return list(color_scheme.palette.colors.values())
-    return list(color_scheme.colors.values())
 
+    srgb: tuple[tuple[int, int, int], ...]
+    linear: np.ndarray
+    linear_f64: np.ndarray
+    lab: np.ndarray
+    rgb: tuple[tuple[float, float, float], ...]
+    flat_palette: list[int]
 
-def error_diffusion_dither(
-    image: Image.Image,
-    color_scheme: ColorScheme | ColorPalette,
-    kernel: ErrorDiffusionKernel,
-    serpentine: bool = True,
-    tone_compression: float | str = "auto",
-) -> Image.Image:
-    """Generic error diffusion dithering with any kernel.
 
-    This function handles all aspects of error diffusion dithering:
-    - Image preprocessing (RGBA → RGB on white, gamma correction)
-    - Palette conversion to linear space
-    - Serpentine or raster scanning
-    - Error diffusion using provided kernel
-    - Output assembly
+@lru_cache(maxsize=None)
+def _get_palette_data(palette_srgb: tuple[tuple[int, int, int], ...]) -> _PaletteData:
+    """Build (and cache) all palette-derived data for a palette.
 
-    Working in linear RGB space ensures that error distribution is
-    perceptually correct. Errors are calculated and propagated in
-    linear light values, not gamma-encoded sRGB.
+    Keyed on the palette color tuple so both ColorScheme members and
+    equal-valued custom ColorPalette instances share one cache entry.
 
     Args:
-        image: Input image (any PIL mode)
-        color_scheme: Target color scheme
-        kernel: Error diffusion kernel specification
-        serpentine: Use serpentine scanning to reduce directional artifacts
+        palette_srgb: Palette colors as a hashable tuple of RGB tuples
 
     Returns:
-        Dithered palette image in sRGB
-
-    Notes:
-        - RGBA images are composited on WHITE background (e-paper assumption)
-        - Error buffer is unbounded during processing (can go negative or >1.0)
-        - Clamping only occurs when reading pixels for quantization
-        - Serpentine scanning alternates row direction to eliminate worm artifacts
+        Cached _PaletteData instance
     """
-    # ===== Image Preprocessing =====
-    # Convert to RGB, handling alpha channel properly
-    if image.mode == "RGBA":
-        # Composite on WHITE background (e-paper displays have white base)
-        background = Image.new("RGB", image.size, (255, 255, 255))
-        background.paste(image, mask=image.split()[3])  # Use alpha as mask
-        image = background
-    elif image.mode != "RGB":
-        image = image.convert("RGB")
+    palette_linear = srgb_to_linear(np.array(palette_srgb, dtype=np.float32))
+    return _PaletteData(
+        srgb=palette_srgb,
+        linear=palette_linear,
+        linear_f64=palette_linear.astype(np.float64),
+        lab=precompute_palette_lab(palette_linear),
+        rgb=tuple(
+            (float(palette_linear[i, 0]), float(palette_linear[i, 1]), float(palette_linear[i, 2]))
+            for i in range(len(palette_srgb))
+        ),
+        flat_palette=[c for rgb in palette_srgb for c in rgb],
+    )
 
-    # ===== Color Space Conversion =====
-    # Convert from sRGB [0-255] to linear RGB [0.0-1.0]
-    pixels_srgb = np.array(image, dtype=np.uint8)
-    pixels_linear = srgb_to_linear(pixels_srgb.astype(np.float32))
-    height, width = pixels_linear.shape[:2]
 
-    # Convert palette to linear space
-    palette_srgb = get_palette_colors(color_scheme)
-    palette_linear = srgb_to_linear(np.array(palette_srgb, dtype=np.float32))
+@lru_cache(maxsize=None)
+def _get_palette_index_lut(palette_srgb: tuple[tuple[int, int, int], ...]) -> np.ndarray:
+    """Build (and cache) a quantized sRGB -> palette index lookup table.
 
-    # Compress dynamic range for measured palettes
-    if isinstance(color_scheme, ColorPalette) and tone_compression != 0:
-        if tone_compression == "auto":
-            pixels_linear = auto_compress_dynamic_range(pixels_linear, palette_linear)
-        else:
-            pixels_linear = compress_dynamic_range(pixels_linear, palette_linear, tone_compression)
+    Direct palette mapping is a pure function of the sRGB input, so the
+    full LAB nearest-color search can be precomputed over a 5-bit-per-
+    channel quantized RGB grid: 32768 entries, 32 KB. Each bucket is
+    matched at its reconstructed center value, so exact palette colors
+    still land on their own index. With typical <=7-color e-paper
+    palettes the residual quantization of the input side is invisible
+    after palettization.
+
+    Args:
+        palette_srgb: Palette colors as a hashable tuple of RGB tuples
+
+    Returns:
+        uint8 array of 32768 palette indices, indexed by
+        (R >> 3) << 10 | (G >> 3) << 5 | (B >> 3)
+    """
+    # Reconstruct 8-bit bucket centers from the 5-bit codes (v<<3 | v>>2)
+    v5 = np.arange(32, dtype=np.uint8)
+    centers = (v5 << 3) | (v5 >> 2)
+
+    grid = np.empty((32, 32, 32, 3), dtype=np.uint8)
+    grid[..., 0] = centers[:, np.newaxis, np.newaxis]
+    grid[..., 1] = centers[np.newaxis, :, np.newaxis]
+    grid[..., 2] = centers[np.newaxis, np.newaxis, :]
 
-    # Pre-compute palette LAB components for scalar per-pixel matching
-    palette_L, palette_a, palette_b, palette_C = precompute_palette_lab(palette_linear)
+    palette = _get_palette_data(palette_srgb)
+    indices = find_closest_palette_color_lab(_SRGB_TO_LINEAR_LUT[grid], palette.linear)
+    return indices.reshape(-1).astype(np.uint8)
 
-    # Pre-extract palette linear RGB as Python floats (avoids numpy indexing in loop)
-    palette_rgb = [
-        (float(palette_linear[i, 0]), float(palette_linear[i, 1]), float(palette_linear[i, 2]))
-        for i in range(len(palette_srgb))
-    ]
 
-    # Pre-normalize kernel weights (eliminates division per pixel)
-    normalized_offsets = [(dx, dy, weight / kernel.divisor) for dx, dy, weight in kernel.offsets]
+def _error_diffusion_python(
+    pixels_linear: np.ndarray,
+    palette_lab: np.ndarray,
+    palette_rgb: list[tuple[float, float, float]],
+    normalized_offsets: list[tuple[int, int, float]],
+    serpentine: bool,
+) -> np.ndarray:
+    """Pure-Python error diffusion scan (fallback when numba is unavailable).
+
+    Args:
+        pixels_linear: Image in linear RGB, shape (H, W, 3). Modified in
+            place as errors are distributed.
+        palette_lab: Packed palette LAB from precompute_palette_lab(),
+            shape (N, 4), columns [L, a, b, C]
+        palette_rgb: Palette linear RGB as Python float tuples
+        normalized_offsets: Kernel offsets with pre-normalized weights
+        serpentine: Alternate scan direction each row
 
-    # ===== Output Preparation =====
-    output = Image.new("P", (width, height))
+    Returns:
+        Palette index array, shape (H, W), dtype uint8
+    """
+    height, width = pixels_linear.shape[:2]
     output_pixels = np.zeros((height, width), dtype=np.uint8)
 
-    # ===== Error Diffusion Loop =====
+    # Flat 1-D view of the pixel buffer: single-integer indexing is
+    # noticeably cheaper in CPython than (y, x, c) tuple indexing, and
+    # this loop is pure interpreter overhead
+    pf = pixels_linear.reshape(-1)
+
+    # Store the kernel twice (left-to-right and mirrored) and pick per row,
+    # instead of sign-flipping dx for every offset of every pixel
+    offsets_lr = normalized_offsets
+    offsets_rl = [(-dx, dy, nw) for dx, dy, nw in normalized_offsets]
+
+    # Both scan orders built once, picked per row
+    x_fwd = range(width)  # Left to right
+    x_rev = range(width - 1, -1, -1)  # Right to left
+
     for y in range(height):
         # Serpentine scanning: alternate direction each row
         if serpentine and y % 2 == 1:
-            x_range = range(width - 1, -1, -1)  # Right to left
+            x_range = x_rev
+            offsets = offsets_rl
         else:
-            x_range = range(width)  # Left to right
+            x_range = x_fwd
+            offsets = offsets_lr
+
+        row_base = y * width
 
         for x in x_range:
+            base = (row_base + x) * 3
+
             # Read current pixel as scalars (clamped to valid range)
             # Note: pixels_linear buffer can be outside [0, 1] due to error accumulation
-            r = max(0.0, min(1.0, float(pixels_linear[y, x, 0])))
-            g = max(0.0, min(1.0, float(pixels_linear[y, x, 1])))
-            b = max(0.0, min(1.0, float(pixels_linear[y, x, 2])))
+            r = max(0.0, min(1.0, float(pf[base])))
+            g = max(0.0, min(1.0, float(pf[base + 1])))
+            b = max(0.0, min(1.0, float(pf[base + 2])))
 
             # Find closest palette color using LCH-weighted LAB distance
-            new_idx = _match_pixel_lch(r, g, b, palette_L, palette_a, palette_b, palette_C)
+            new_idx = _match_pixel_lch(r, g, b, palette_lab)
 
             # Store palette index
             output_pixels[y, x] = new_idx
@@ -241,29 +278,215 @@ def error_diffusion_dither(
             err_b = b - pb
 
             # Distribute error using pre-normalized kernel weights
-            for dx, dy, nw in normalized_offsets:
-                # Flip horizontal offset if serpentine on odd row
-                if serpentine and y % 2 == 1:
-                    dx = -dx
-
+            for dx, dy, nw in offsets:
                 nx, ny = x + dx, y + dy
 
                 # Check bounds and distribute error
                 if 0 <= nx < width and 0 <= ny < height:
-                    pixels_linear[ny, nx, 0] += err_r * nw
-                    pixels_linear[ny, nx, 1] += err_g * nw
-                    pixels_linear[ny, nx, 2] += err_b * nw
+                    nbase = (ny * width + nx) * 3
+                    pf[nbase] += err_r * nw
+                    pf[nbase + 1] += err_g * nw
+                    pf[nbase + 2] += err_b * nw
 
-    # ===== Output Assembly =====
-    output.putdata(output_pixels.flatten())
+    return output_pixels
 
-    # Set palette (in sRGB)
-    flat_palette = [c for rgb in palette_srgb for c in rgb]
-    output.putpalette(flat_palette)
 
+def _to_rgb_pixels(image: Image.Image | np.ndarray) -> np.ndarray:
+    """Read an image as an (H, W, 3) uint8 array, compositing RGBA on white.
+
+    The PIL route (split() for the alpha band, a white background image,
+    paste() with mask) allocates four intermediate images per call. One
+    numpy read and a vectorized blend against white do the same job;
+    e-paper displays have a white base, hence the background choice.
+
+    Pre-decoded (H, W, 3) or (H, W, 4) uint8 arrays are accepted
+    directly so batch pipelines that already hold numpy frames skip the
+    PIL round-trip entirely.
+
+    Args:
+        image: Input image (any PIL mode, or an (H, W, 3|4) uint8 array)
+
+    Returns:
+        uint8 array, shape (H, W, 3). A zero-copy view of the input
+        buffer when it is already RGB; a fresh array otherwise.
+    """
+    if isinstance(image, np.ndarray):
+        if image.ndim != 3 or image.shape[2] not in (3, 4) or image.dtype != np.uint8:
+            raise ValueError(
+                f"Expected (H, W, 3) or (H, W, 4) uint8 array, "
+                f"got shape {image.shape} dtype {image.dtype}"
+            )
+        arr = image
+    elif image.mode == "RGBA":
+        arr = np.asarray(image)
+    else:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return np.asarray(image)
+
+    if arr.shape[2] == 4:
+        alpha = arr[..., 3:].astype(np.float32) / 255.0
+        rgb = arr[..., :3] * alpha + 255.0 * (1.0 - alpha)
+        return (rgb + 0.5).astype(np.uint8)
+    return arr
+
+
+def _to_palette_image(output_pixels: np.ndarray, flat_palette: list[int]) -> Image.Image:
+    """Wrap an (H, W) palette index array into a P-mode image.
+
+    Image.frombuffer shares the ndarray's memory directly instead of the
+    putdata path, which iterates a Python sequence of H*W ints.
+
+    Args:
+        output_pixels: Palette indices, shape (H, W)
+        flat_palette: Flattened sRGB palette for Image.putpalette()
+
+    Returns:
+        P-mode image with the palette applied
+    """
+    if output_pixels.dtype != np.uint8:
+        output_pixels = output_pixels.astype(np.uint8)
+    height, width = output_pixels.shape
+    output = Image.frombuffer("P", (width, height), np.ascontiguousarray(output_pixels), "raw", "P", 0, 1)
+    output.putpalette(flat_palette)
     return output
 
 
+def get_palette_colors(color_scheme: ColorScheme | ColorPalette) -> list[tuple[int, int, int]]:
+    """Get RGB palette for color scheme or custom palette.
+
+    Args:
+        color_scheme: Display color scheme enum OR custom ColorPalette
+
+    Returns:
+        List of RGB tuples for palette (order matters for encoding)
+    """
+    if isinstance(color_scheme, ColorScheme):
+        return list(color_scheme.palette.colors.values())
+    return list(color_scheme.colors.values())
+
+
+def _error_diffusion_indices(
+    image: Image.Image | np.ndarray,
+    color_scheme: ColorScheme | ColorPalette,
+    kernel: ErrorDiffusionKernel,
+    serpentine: bool = True,
+    tone_compression: float | str = "auto",
+) -> tuple[np.ndarray, _PaletteData]:
+    """Error diffusion core: returns raw palette indices, not an image.
+
+    Shared by error_diffusion_dither (which wraps the result in a P-mode
+    image) and the array-returning API in core, so batch consumers can
+    skip the PIL round trip.
+
+    Returns:
+        ((H, W) uint8 palette index array, cached palette data)
+    """
+    # ===== Image Preprocessing =====
+    # RGB uint8 view of the input, RGBA composited on white numerically
+    pixels_srgb = _to_rgb_pixels(image)
+
+    height, width = pixels_srgb.shape[:2]
+
+    # Palette-derived data (linear RGB, LAB components) is cached per palette
+    palette = _get_palette_data(tuple(get_palette_colors(color_scheme)))
+    palette_linear = palette.linear
+
+    # ===== Color Space Conversion =====
+    # Convert from sRGB [0-255] to linear RGB [0.0-1.0] via the LUT,
+    # compressing dynamic range for measured palettes. Fixed-strength
+    # compression fuses with the decode; auto needs image-wide luminance
+    # statistics first, so it decodes and then compresses in place.
+    if isinstance(color_scheme, ColorPalette) and tone_compression != 0:
+        if tone_compression == "auto":
+            pixels_linear = _SRGB_TO_LINEAR_LUT[pixels_srgb]
+            pixels_linear = auto_compress_dynamic_range(
+                pixels_linear, palette_linear, out=pixels_linear,
+            )
+        else:
+            pixels_linear = compress_dynamic_range_srgb(
+                pixels_srgb, palette_linear, tone_compression,
+            )
+    else:
+        pixels_linear = _SRGB_TO_LINEAR_LUT[pixels_srgb]
+
+    # ===== Error Diffusion Loop =====
+    if _accel.NUMBA_AVAILABLE:
+        if serpentine:
+            # Serpentine rows scan in opposite directions, so each row
+            # depends on the whole previous row: serial loop only. One
+            # compiled specialization per kernel with the offsets baked in.
+            loop = _accel.get_error_diffusion_loop(
+                kernel.name,
+                tuple((dx, dy, w / kernel.divisor) for dx, dy, w in kernel.offsets),
+            )
+            output_pixels = loop(
+                pixels_linear, _accel.get_lab_lut(), palette.lab, palette.linear_f64, serpentine,
+            )
+        else:
+            # Raster scan: pixels on a skewed anti-diagonal are independent,
+            # process wavefronts in parallel across cores
+            radius = max(abs(dx) for dx, _, _ in kernel.offsets)
+            output_pixels = _accel.error_diffusion_wavefront(
+                pixels_linear, _accel.get_lab_lut(), palette.lab, palette.linear_f64,
+                np.array([dx for dx, _, _ in kernel.offsets], dtype=np.int64),
+                np.array([dy for _, dy, _ in kernel.offsets], dtype=np.int64),
+                np.array([w / kernel.divisor for _, _, w in kernel.offsets], dtype=np.float64),
+                2 * radius + 1,
+            )
+    else:
+        # Pre-normalize kernel weights (eliminates division per pixel)
+        normalized_offsets = [(dx, dy, weight / kernel.divisor) for dx, dy, weight in kernel.offsets]
+
+        output_pixels = _error_diffusion_python(
+            pixels_linear, palette.lab,
+            list(palette.rgb), normalized_offsets, serpentine,
+        )
+
+    return output_pixels, palette
+
+
+def error_diffusion_dither(
+    image: Image.Image | np.ndarray,
+    color_scheme: ColorScheme | ColorPalette,
+    kernel: ErrorDiffusionKernel,
+    serpentine: bool = True,
+    tone_compression: float | str = "auto",
+) -> Image.Image:
+    """Generic error diffusion dithering with any kernel.
+
+    This function handles all aspects of error diffusion dithering:
+    - Image preprocessing (RGBA → RGB on white, gamma correction)
+    - Palette conversion to linear space
+    - Serpentine or raster scanning
+    - Error diffusion using provided kernel
+    - Output assembly
+
+    Working in linear RGB space ensures that error distribution is
+    perceptually correct. Errors are calculated and propagated in
+    linear light values, not gamma-encoded sRGB.
+
+    Args:
+        image: Input image (any PIL mode)
+        color_scheme: Target color scheme
+        kernel: Error diffusion kernel specification
+        serpentine: Use serpentine scanning to reduce directional artifacts
+
+    Returns:
+        Dithered palette image in sRGB
+
+    Notes:
+        - RGBA images are composited on WHITE background (e-paper assumption)
+        - Error buffer is unbounded during processing (can go negative or >1.0)
+        - Clamping only occurs when reading pixels for quantization
+        - Serpentine scanning alternates row direction to eliminate worm artifacts
+    """
+    output_pixels, palette = _error_diffusion_indices(
+        image, color_scheme, kernel, serpentine, tone_compression,
+    )
+    return _to_palette_image(output_pixels, palette.flat_palette)
+
+
 # =============================================================================
 # Individual Error Diffusion Algorithms (Thin Wrappers)
 # =============================================================================
@@ -273,7 +496,7 @@ def error_diffusion_dither(
 
 
 def floyd_steinberg_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette,
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette,
     serpentine: bool = True, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply Floyd-Steinberg error diffusion dithering.
@@ -297,7 +520,7 @@ def floyd_steinberg_dither(
 
 
 def burkes_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette,
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette,
     serpentine: bool = True, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply Burkes error diffusion dithering.
@@ -319,7 +542,7 @@ def burkes_dither(
 
 
 def sierra_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette,
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette,
     serpentine: bool = True, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply Sierra error diffusion dithering.
@@ -344,7 +567,7 @@ def sierra_dither(
 
 
 def sierra_lite_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette,
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette,
     serpentine: bool = True, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply Sierra Lite error diffusion dithering.
@@ -368,7 +591,7 @@ def sierra_lite_dither(
 
 
 def atkinson_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette,
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette,
     serpentine: bool = True, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply Atkinson error diffusion dithering.
@@ -393,7 +616,7 @@ def atkinson_dither(
 
 
 def stucki_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette,
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette,
     serpentine: bool = True, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply Stucki error diffusion dithering.
@@ -418,7 +641,7 @@ def stucki_dither(
 
 
 def jarvis_judice_ninke_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette,
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette,
     serpentine: bool = True, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply Jarvis-Judice-Ninke error diffusion dithering.
@@ -447,8 +670,56 @@ def jarvis_judice_ninke_dither(
 # =============================================================================
 
 
+def _direct_palette_map_indices(
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette, tone_compression: float | str = "auto",
+) -> tuple[np.ndarray, _PaletteData]:
+    """Direct mapping core: returns raw palette indices, not an image.
+
+    Returns:
+        ((H, W) uint8 palette index array, cached palette data)
+    """
+    palette_srgb = tuple(get_palette_colors(color_scheme))
+    palette = _get_palette_data(palette_srgb)
+    # RGB uint8 view of the input, RGBA composited on white numerically
+    pixels_srgb = _to_rgb_pixels(image)
+    height, width = pixels_srgb.shape[:2]
+
+    # ===== VECTORIZED PALETTE MAPPING =====
+
+    if isinstance(color_scheme, ColorPalette) and tone_compression != 0:
+        # Measured palette with tone compression: pixels leave the uint8
+        # domain, so match in LAB on the compressed linear values
+        if tone_compression == "auto":
+            pixels_linear = _SRGB_TO_LINEAR_LUT[pixels_srgb]
+            pixels_linear = auto_compress_dynamic_range(
+                pixels_linear, palette.linear, out=pixels_linear,
+            )
+        else:
+            pixels_linear = compress_dynamic_range_srgb(
+                pixels_srgb, palette.linear, tone_compression,
+            )
+        if _accel.NUMBA_AVAILABLE:
+            # Fully data-parallel: match rows across cores with no
+            # image-sized temporaries
+            output_pixels = _accel.match_image_lch(pixels_linear, palette.lab)
+        else:
+            output_pixels = find_closest_palette_color_lab(pixels_linear, palette.linear)
+    else:
+        # Pure uint8 -> index mapping: gather through the cached 32 KB
+        # quantized LUT, no color space conversion or search per pixel
+        lut = _get_palette_index_lut(palette_srgb)
+        quantized = (
+            (pixels_srgb[..., 0].astype(np.uint32) >> 3) << 10
+            | (pixels_srgb[..., 1].astype(np.uint32) >> 3) << 5
+            | (pixels_srgb[..., 2].astype(np.uint32) >> 3)
+        )
+        output_pixels = lut[quantized]
+
+    return output_pixels, palette
+
+
 def direct_palette_map(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette, tone_compression: float | str = "auto",
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Map image colors directly to palette without dithering.
 
@@ -460,47 +731,74 @@ def direct_palette_map(
     Returns:
         Image with palette colors
     """
-    # Handle alpha channel properly (composite on white)
-    if image.mode == "RGBA":
-        background = Image.new("RGB", image.size, (255, 255, 255))
-        background.paste(image, mask=image.split()[3])
-        image = background
-    elif image.mode != "RGB":
-        image = image.convert("RGB")
-
-    palette_srgb = get_palette_colors(color_scheme)
-    pixels_srgb = np.array(image, dtype=np.uint8)
+    output_pixels, palette = _direct_palette_map_indices(image, color_scheme, tone_compression)
+    return _to_palette_image(output_pixels, palette.flat_palette)
+
+
+def _ordered_dither_indices(
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette, tone_compression: float | str = "auto",
+) -> tuple[np.ndarray, _PaletteData]:
+    """Ordered dithering core: returns raw palette indices, not an image.
+
+    Returns:
+        ((H, W) uint8 palette index array, cached palette data)
+    """
+    # ===== Image Preprocessing =====
+    # RGB uint8 view of the input, RGBA composited on white numerically
+    pixels_srgb = _to_rgb_pixels(image)
     height, width = pixels_srgb.shape[:2]
 
-    # ===== VECTORIZED PALETTE MAPPING =====
+    # Cached palette in linear space
+    palette = _get_palette_data(tuple(get_palette_colors(color_scheme)))
+    palette_linear = palette.linear
 
-    # Convert to linear space for perceptual accuracy
-    pixels_linear = srgb_to_linear(pixels_srgb.astype(np.float32))
+    compressed = isinstance(color_scheme, ColorPalette) and tone_compression != 0
 
-    # Convert palette to linear space
-    palette_linear = srgb_to_linear(np.array(palette_srgb, dtype=np.float32))
+    # ===== VECTORIZED ORDERED DITHERING =====
 
-    # Compress dynamic range for measured palettes
-    if isinstance(color_scheme, ColorPalette) and tone_compression != 0:
+    if _accel.NUMBA_AVAILABLE and not compressed:
+        # Fully fused: gamma decode + threshold + clamp + match in one
+        # pass straight from uint8 — the linear intermediate is never built
+        output_pixels = _accel.ordered_dither_kernel_srgb(
+            pixels_srgb, _SRGB_TO_LINEAR_LUT, _BAYER_4X4, palette.lab,
+        )
+        return output_pixels, palette
+
+    # Compress dynamic range for measured palettes (fixed strength fuses
+    # with the gamma decode; auto decodes first for its luminance stats)
+    if compressed:
         if tone_compression == "auto":
-            pixels_linear = auto_compress_dynamic_range(pixels_linear, palette_linear)
+            pixels_linear = _SRGB_TO_LINEAR_LUT[pixels_srgb]
+            pixels_linear = auto_compress_dynamic_range(
+                pixels_linear, palette_linear, out=pixels_linear,
+            )
         else:
-            pixels_linear = compress_dynamic_range(pixels_linear, palette_linear, tone_compression)
+            pixels_linear = compress_dynamic_range_srgb(
+                pixels_srgb, palette_linear, tone_compression,
+            )
+    else:
+        pixels_linear = _SRGB_TO_LINEAR_LUT[pixels_srgb]
 
-    # Find closest palette color for ALL pixels at once using LAB
-    output_pixels = find_closest_palette_color_lab(pixels_linear, palette_linear)
+    if _accel.NUMBA_AVAILABLE:
+        # Fused threshold + clamp + match: one pass, no image-sized temporaries
+        output_pixels = _accel.ordered_dither_kernel(pixels_linear, _BAYER_4X4, palette.lab)
+    else:
+        # Tile the 4x4 matrix over the image: replicates one small contiguous
+        # block instead of building H*W fancy-index arrays and gathering
+        threshold_matrix = np.tile(_BAYER_4X4, (height // 4 + 1, width // 4 + 1))[:height, :width]
 
-    # ===== Output Assembly =====
-    output = Image.new("P", (width, height))
-    output.putdata(output_pixels.flatten())
-    flat_palette = [c for rgb in palette_srgb for c in rgb]
-    output.putpalette(flat_palette)
+        # Add threshold to all pixels at once
+        dithered_pixels = pixels_linear + threshold_matrix[:, :, np.newaxis]
+        dithered_pixels = np.clip(dithered_pixels, 0.0, 1.0)
 
-    return output
+        # Find closest palette color for ALL pixels at once using LAB
+        output_pixels = find_closest_palette_color_lab(dithered_pixels, palette_linear)
+
+    return output_pixels, palette
 
 
 def ordered_dither(
-    image: Image.Image, color_scheme: ColorScheme | ColorPalette, tone_compression: float | str = "auto",
+    image: Image.Image | np.ndarray, color_scheme: ColorScheme | ColorPalette, tone_compression: float | str = "auto",
 ) -> Image.Image:
     """Apply ordered (Bayer) dithering with full vectorization.
 
@@ -525,56 +823,5 @@ def ordered_dither(
         - Uses perceptual color distance (ITU-R BT.601 luma weights)
         - Works in linear RGB space for correct quantization
     """
-    # Bayer 4x4 matrix normalized to [-0.5, 0.5] (centered around 0)
-    bayer_matrix = (
-        np.array([[0, 8, 2, 10], [12, 4, 14, 6], [3, 11, 1, 9], [15, 7, 13, 5]],
-                 dtype=np.float32)
-        / 16.0
-        - 0.5
-    )
-
-    # ===== Image Preprocessing =====
-    if image.mode == "RGBA":
-        background = Image.new("RGB", image.size, (255, 255, 255))
-        background.paste(image, mask=image.split()[3])
-        image = background
-    elif image.mode != "RGB":
-        image = image.convert("RGB")
-
-    # ===== Color Space Conversion =====
-    pixels_srgb = np.array(image, dtype=np.uint8)
-    pixels_linear = srgb_to_linear(pixels_srgb.astype(np.float32))
-    height, width = pixels_linear.shape[:2]
-
-    # Convert palette to linear space
-    palette_srgb = get_palette_colors(color_scheme)
-    palette_linear = srgb_to_linear(np.array(palette_srgb, dtype=np.float32))
-
-    # Compress dynamic range for measured palettes
-    if isinstance(color_scheme, ColorPalette) and tone_compression != 0:
-        if tone_compression == "auto":
-            pixels_linear = auto_compress_dynamic_range(pixels_linear, palette_linear)
-        else:
-            pixels_linear = compress_dynamic_range(pixels_linear, palette_linear, tone_compression)
-
-    # ===== VECTORIZED ORDERED DITHERING =====
-
-    # Create threshold matrix for entire image using broadcasting
-    y_indices = np.arange(height)[:, np.newaxis] % 4  # Shape: (height, 1)
-    x_indices = np.arange(width)[np.newaxis, :] % 4   # Shape: (1, width)
-    threshold_matrix = bayer_matrix[y_indices, x_indices]  # Shape: (height, width)
-
-    # Add threshold to all pixels at once
-    dithered_pixels = pixels_linear + threshold_matrix[:, :, np.newaxis]
-    dithered_pixels = np.clip(dithered_pixels, 0.0, 1.0)
-
-    # Find closest palette color for ALL pixels at once using LAB
-    output_pixels = find_closest_palette_color_lab(dithered_pixels, palette_linear)
-
-    # ===== Output Assembly =====
-    output = Image.new("P", (width, height))
-    output.putdata(output_pixels.flatten())
-    flat_palette = [c for rgb in palette_srgb for c in rgb]
-    output.putpalette(flat_palette)
-
-    return output
+    output_pixels, palette = _ordered_dither_indices(image, color_scheme, tone_compression)
+    return _to_palette_image(output_pixels, palette.flat_palette)
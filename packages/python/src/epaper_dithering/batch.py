@@ -0,0 +1,163 @@
+"""Reusable dithering state for batch workloads (animations, page streams).
+
+The per-image entry points in algorithms.py are stateless: every call
+resolves the palette caches, looks up the compiled kernel, and allocates
+a fresh linear-RGB working buffer. For workloads that dither many frames
+of the same size against the same palette — animation previews, PDF page
+streams, slideshow renderers — that per-call overhead is pure waste.
+
+BatchDitherer resolves the palette data and kernel once at construction
+and reuses a single preallocated linear-RGB buffer across frames.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from PIL import Image
+
+from . import _accel
+from .algorithms import (
+    FLOYD_STEINBERG,
+    ErrorDiffusionKernel,
+    _error_diffusion_python,
+    _get_palette_data,
+    _to_palette_image,
+    _to_rgb_pixels,
+    get_palette_colors,
+)
+from .color_space import _SRGB_TO_LINEAR_LUT
+from .palettes import ColorPalette, ColorScheme
+from .tone_map import auto_compress_dynamic_range, compress_dynamic_range_srgb
+
+
+class BatchDitherer:
+    """Error diffusion dithering with state shared across same-sized frames.
+
+    Resolves the palette-derived data and the compiled kernel once in the
+    constructor, then reuses one preallocated linear-RGB buffer for every
+    frame. Produces exactly the same output as error_diffusion_dither();
+    the only difference is where the setup cost is paid.
+
+    Example:
+        >>> ditherer = BatchDitherer(ColorScheme.BWR, size=(800, 480))
+        >>> for frame in frames:
+        ...     result = ditherer.run(frame)
+
+    Args:
+        color_scheme: Target color scheme OR custom ColorPalette
+        kernel: Error diffusion kernel specification
+        size: Expected frame size as (width, height). If None, it is
+            taken from the first frame passed to run().
+        serpentine: Use serpentine scanning (reduces artifacts)
+        tone_compression: Dynamic range compression strength (0.0-1.0)
+
+    Notes:
+        - All frames must share one size; run() raises ValueError otherwise
+        - Not thread-safe: the linear buffer is shared between run() calls
+    """
+
+    def __init__(
+        self,
+        color_scheme: ColorScheme | ColorPalette,
+        kernel: ErrorDiffusionKernel = FLOYD_STEINBERG,
+        size: tuple[int, int] | None = None,
+        serpentine: bool = True,
+        tone_compression: float | str = "auto",
+    ) -> None:
+        self._color_scheme = color_scheme
+        self._kernel = kernel
+        self._serpentine = serpentine
+        self._tone_compression = tone_compression
+
+        # Resolve all palette-derived data once (shared LRU entries)
+        self._palette = _get_palette_data(tuple(get_palette_colors(color_scheme)))
+
+        # Pre-normalize kernel weights once
+        self._normalized_offsets = [
+            (dx, dy, weight / kernel.divisor) for dx, dy, weight in kernel.offsets
+        ]
+
+        # Resolve the compiled kernel reference once; first run() still
+        # pays JIT compilation unless the specialization is already warm
+        if _accel.NUMBA_AVAILABLE:
+            self._lab_lut = _accel.get_lab_lut()
+            if serpentine:
+                self._loop = _accel.get_error_diffusion_loop(
+                    kernel.name, tuple(self._normalized_offsets),
+                )
+
+        # Reusable linear-RGB frame buffer, lazily sized from the first frame
+        self._pixels_linear: np.ndarray | None = None
+        if size is not None:
+            width, height = size
+            self._pixels_linear = np.empty((height, width, 3), dtype=np.float32)
+
+    def run(self, image: Image.Image | np.ndarray) -> Image.Image:
+        """Dither one frame, reusing the preallocated buffers.
+
+        Args:
+            image: Input frame (any PIL mode, or an (H, W, 3|4) uint8
+                array). Must match the size of the first frame (or the
+                size given to the constructor).
+
+        Returns:
+            Dithered palette image, identical to error_diffusion_dither()
+        """
+        # ===== Image Preprocessing =====
+        pixels_srgb = _to_rgb_pixels(image)
+        height, width = pixels_srgb.shape[:2]
+
+        if self._pixels_linear is None:
+            self._pixels_linear = np.empty((height, width, 3), dtype=np.float32)
+        elif self._pixels_linear.shape[:2] != (height, width):
+            expected = (self._pixels_linear.shape[1], self._pixels_linear.shape[0])
+            raise ValueError(
+                f"Frame size {(width, height)} does not match ditherer size {expected}"
+            )
+
+        # Gamma decode into the reusable buffer, compressing dynamic range
+        # for measured palettes. Fixed-strength compression fuses with the
+        # decode; auto decodes first (it needs each frame's luminance
+        # statistics) and then compresses in place. Either way the only
+        # image-sized buffer touched is the preallocated one.
+        tone_compression = self._tone_compression
+        if isinstance(self._color_scheme, ColorPalette) and tone_compression != 0:
+            if tone_compression == "auto":
+                pixels_linear = np.take(
+                    _SRGB_TO_LINEAR_LUT, pixels_srgb, out=self._pixels_linear,
+                )
+                pixels_linear = auto_compress_dynamic_range(
+                    pixels_linear, self._palette.linear, out=pixels_linear,
+                )
+            else:
+                pixels_linear = compress_dynamic_range_srgb(
+                    pixels_srgb, self._palette.linear, tone_compression,
+                    out=self._pixels_linear,
+                )
+        else:
+            pixels_linear = np.take(_SRGB_TO_LINEAR_LUT, pixels_srgb, out=self._pixels_linear)
+
+        # ===== Error Diffusion Loop =====
+        if _accel.NUMBA_AVAILABLE:
+            if self._serpentine:
+                output_pixels = self._loop(
+                    pixels_linear, self._lab_lut, self._palette.lab,
+                    self._palette.linear_f64, True,
+                )
+            else:
+                radius = max(abs(dx) for dx, _, _ in self._kernel.offsets)
+                output_pixels = _accel.error_diffusion_wavefront(
+                    pixels_linear, self._lab_lut, self._palette.lab, self._palette.linear_f64,
+                    np.array([dx for dx, _, _ in self._kernel.offsets], dtype=np.int64),
+                    np.array([dy for _, dy, _ in self._kernel.offsets], dtype=np.int64),
+                    np.array([w for _, _, w in self._normalized_offsets], dtype=np.float64),
+                    2 * radius + 1,
+                )
+        else:
+            output_pixels = _error_diffusion_python(
+                pixels_linear, self._palette.lab,
+                list(self._palette.rgb), self._normalized_offsets, self._serpentine,
+            )
+
+        # ===== Output Assembly =====
+        return _to_palette_image(output_pixels, self._palette.flat_palette)
@@ -96,12 +96,25 @@ def linear_to_srgb(linear: np.ndarray) -> np.ndarray:
     """
     # Apply sRGB gamma (piecewise)
     # The threshold 0.0031308 corresponds to sRGB value 0.04045
-    normalized = np.where(
+    # (clamping the gamma-branch input at 0 keeps pow() off negative values)
+    srgb = np.where(
         linear <= 0.0031308,
         linear * 12.92,  # Linear section
-        1.055 * np.power(linear, 1.0 / 2.4) - 0.055  # Gamma section
+        1.055 * np.power(np.maximum(linear, 0.0), 1.0 / 2.4) - 0.055  # Gamma section
     )
 
-    # Convert to [0, 255] and round (not truncate!)
-    # Rounding prevents systematic darkening bias from truncation
-    return np.round(normalized * 255.0).astype(np.uint8)
+    # Scale, round (not truncate!), clamp, and narrow — all in place on
+    # the np.where result instead of allocating per step. Rounding
+    # prevents systematic darkening bias from truncation; the clamp makes
+    # out-of-range linear input saturate instead of wrapping in the uint8
+    # cast.
+    srgb *= 255.0
+    np.rint(srgb, out=srgb)
+    np.clip(srgb, 0.0, 255.0, out=srgb)
+    return srgb.astype(np.uint8)
+
+
+# Precomputed sRGB -> linear table for uint8 input. Images only ever contain
+# 256 distinct sRGB values, so indexing this table replaces a pow() per pixel
+# with a single lookup: `linear = _SRGB_TO_LINEAR_LUT[pixels_uint8]`.
+_SRGB_TO_LINEAR_LUT = srgb_to_linear(np.arange(256, dtype=np.float32))
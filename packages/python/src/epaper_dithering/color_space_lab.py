@@ -49,6 +49,14 @@ _YN = 1.00000
 _ZN = 1.08883
 _D65_WHITE = np.array([_XN, _YN, _ZN], dtype=np.float64)
 
+# RGB -> whitepoint-normalized XYZ, with the D65 division folded into the
+# matrix rows so the batch path does one matmul instead of a matmul plus a
+# full-array divide. Stored as float32: pixels arrive as float32 from the
+# gamma LUT, and a float64 constant would silently upcast every LAB
+# temporary to double the bandwidth for precision far below what
+# nearest-of-N palette matching can observe.
+_M_RGB_TO_XYZN_T = (_M_RGB_TO_XYZ / _D65_WHITE[:, np.newaxis]).T.astype(np.float32)
+
 # CIE LAB constants
 _EPSILON = 216.0 / 24389.0  # 0.008856...
 _KAPPA = 24389.0 / 27.0     # 903.296...
@@ -58,6 +66,11 @@ _WL = 0.5   # lightness: de-emphasized (error diffusion compensates)
 _WC = 1.0   # chroma: standard weight
 _WH = 2.0   # hue: emphasized (error diffusion cannot compensate)
 
+# Pixels per block for batch palette matching. Blocking keeps the
+# (chunk, num_colors) distance temporaries inside the cache hierarchy
+# instead of materializing a full (H, W, N) tensor for large images.
+_MATCH_CHUNK = 65536
+
 
 # =============================================================================
 # Vectorized Functions (for batch operations: direct mapping, ordered dither)
@@ -70,27 +83,27 @@ def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
         rgb: Linear RGB values in [0, 1] range. Shape: (..., 3)
 
     Returns:
-        LAB values. L in [0, 100], a and b in [-128, 127]. Shape: (..., 3)
+        LAB values. L in [0, 100], a and b in [-128, 127]. Shape: (..., 3).
+        float32 regardless of input dtype.
     """
-    xyz = rgb @ _M_RGB_TO_XYZ.T
-    xyz_norm = xyz / _D65_WHITE
+    rgb = np.asarray(rgb, dtype=np.float32)
+    xyz_norm = rgb @ _M_RGB_TO_XYZN_T
 
     def f(t: np.ndarray) -> np.ndarray:
-        mask = t > _EPSILON
-        result = np.empty_like(t)
-        result[mask] = np.cbrt(t[mask])
-        result[~mask] = (_KAPPA * t[~mask] + 16.0) / 116.0
-        return result
+        # Evaluate both branches and blend with np.where: cbrt is cheap
+        # vectorized, and this avoids the four mask fancy-index passes
+        # (two gathers, two scatters) of the masked-assignment form
+        return np.where(t > _EPSILON, np.cbrt(t), (_KAPPA * t + 16.0) / 116.0)
 
     fx = f(xyz_norm[..., 0])
     fy = f(xyz_norm[..., 1])
     fz = f(xyz_norm[..., 2])
 
-    L = 116.0 * fy - 16.0
-    a = 500.0 * (fx - fy)
-    b = 200.0 * (fy - fz)
-
-    return np.stack([L, a, b], axis=-1)
+    lab = np.empty_like(xyz_norm)
+    lab[..., 0] = 116.0 * fy - 16.0
+    lab[..., 1] = 500.0 * (fx - fy)
+    lab[..., 2] = 200.0 * (fy - fz)
+    return lab
 
 
 def find_closest_palette_color_lab(
@@ -109,31 +122,54 @@ def find_closest_palette_color_lab(
         palette_linear: Palette colors in linear space. Shape: (num_colors, 3)
 
     Returns:
-        Palette indices. Shape matches input without last dimension.
+        uint8 palette indices. Shape matches input without last dimension.
     """
-    lab_pixels = rgb_to_lab(rgb_linear)
     lab_palette = rgb_to_lab(palette_linear)
 
     # Chroma of each palette color
     C_palette = np.sqrt(lab_palette[:, 1] ** 2 + lab_palette[:, 2] ** 2)
 
-    # Chroma of each pixel
-    C_pixels = np.sqrt(lab_pixels[..., 1] ** 2 + lab_pixels[..., 2] ** 2)
-
-    # Broadcast differences: (..., 1, 3) - (num_colors, 3) -> (..., num_colors, 3)
-    diff = lab_pixels[..., np.newaxis, :] - lab_palette[np.newaxis, :, :]
-    dL = diff[..., 0]
-    da = diff[..., 1]
-    db = diff[..., 2]
-
-    # LCH decomposition: da^2 + db^2 = dC^2 + dH^2
-    dC = C_pixels[..., np.newaxis] - C_palette[np.newaxis, :]
-    dH_sq = np.maximum(0.0, da ** 2 + db ** 2 - dC ** 2)
-
-    # Weighted distance
-    distances = (_WL * dL) ** 2 + (_WC * dC) ** 2 + _WH ** 2 * dH_sq
-
-    return np.argmin(distances, axis=-1)  # type: ignore[no-any-return]
+    # Expanding dH^2 = da^2 + db^2 - dC^2 turns the LCH distance into a
+    # plain weighted squared norm over the packed [L, a, b, C] vector:
+    #   dist = WL^2*dL^2 + WH^2*(da^2 + db^2) + (WC^2 - WH^2)*dC^2
+    # (dC^2 never exceeds da^2 + db^2 by the reverse triangle inequality,
+    # so the explicit max(0, dH^2) clamp is redundant here). That norm in
+    # turn expands as |u|^2 + |v|^2 - 2*u.v, so the per-pixel score
+    # reduces to one (chunk, 4) x (4, num_colors) matmul plus a palette
+    # constant — a BLAS GEMM instead of (chunk, num_colors, 3) broadcast
+    # temporaries. The per-pixel |u|^2 term is constant across colors and
+    # drops out of the argmin entirely.
+    weights = np.array([_WL ** 2, _WH ** 2, _WH ** 2, _WC ** 2 - _WH ** 2], dtype=np.float32)
+    pal4 = np.concatenate([lab_palette, C_palette[:, np.newaxis]], axis=1)
+    pal4_w = (pal4 * weights).T  # (4, num_colors), pre-weighted
+    pal_sq = np.einsum("ij,ij->i", pal4 * weights, pal4)
+
+    # Process pixels in blocks so the (chunk, num_colors) score
+    # temporaries stay cache-resident instead of allocating a full
+    # (H, W, N) float tensor (hundreds of MB for 4K images)
+    # uint8 matches the jitted kernels in _accel and keeps the documented
+    # uint8 index contract of the *_indices entry points when numba is
+    # absent; palette images cap at 256 colors so indices always fit
+    flat = rgb_linear.reshape(-1, 3)
+    indices = np.empty(flat.shape[0], dtype=np.uint8)
+
+    for start in range(0, flat.shape[0], _MATCH_CHUNK):
+        chunk = flat[start:start + _MATCH_CHUNK]
+        lab_pixels = rgb_to_lab(chunk)
+
+        # Packed [L, a, b, C] per pixel
+        pix4 = np.empty((lab_pixels.shape[0], 4), dtype=np.float32)
+        pix4[:, :3] = lab_pixels
+        pix4[:, 3] = np.sqrt(lab_pixels[:, 1] ** 2 + lab_pixels[:, 2] ** 2)
+
+        # score = pal_sq - 2 * u.(w*v); minimizing it minimizes the distance
+        scores = pix4 @ pal4_w
+        scores *= -2.0
+        scores += pal_sq
+
+        indices[start:start + _MATCH_CHUNK] = np.argmin(scores, axis=-1)
+
+    return indices.reshape(rgb_linear.shape[:-1])
 
 
 # =============================================================================
@@ -167,19 +203,16 @@ def _rgb_to_lab_scalar(r: float, g: float, b: float) -> tuple[float, float, floa
 
 def _match_pixel_lch(
     r: float, g: float, b: float,
-    palette_L: tuple[float, ...],
-    palette_a: tuple[float, ...],
-    palette_b: tuple[float, ...],
-    palette_C: tuple[float, ...],
+    palette_lab: np.ndarray,
 ) -> int:
     """Find closest palette color for a single pixel using LCH distance.
 
-    Pure Python (no numpy) for minimal per-call overhead in error diffusion.
+    Scalar per-pixel path used by the error diffusion fallback loop.
 
     Args:
         r, g, b: Pixel in linear RGB [0, 1]
-        palette_L, palette_a, palette_b: Pre-computed LAB components of palette
-        palette_C: Pre-computed chroma of palette colors
+        palette_lab: Packed palette LAB from precompute_palette_lab(),
+            shape (num_colors, 4) with columns [L, a, b, C]
 
     Returns:
         Index of closest palette color
@@ -190,11 +223,11 @@ def _match_pixel_lch(
     best_idx = 0
     best_dist = float("inf")
 
-    for i in range(len(palette_L)):
-        dL = pL - palette_L[i]
-        da = pa - palette_a[i]
-        db = pb - palette_b[i]
-        dC = pC - palette_C[i]
+    for i in range(palette_lab.shape[0]):
+        dL = pL - palette_lab[i, 0]
+        da = pa - palette_lab[i, 1]
+        db = pb - palette_lab[i, 2]
+        dC = pC - palette_lab[i, 3]
         dH_sq = da * da + db * db - dC * dC
         if dH_sq < 0.0:
             dH_sq = 0.0
@@ -207,23 +240,23 @@ def _match_pixel_lch(
     return best_idx
 
 
-def precompute_palette_lab(palette_linear: np.ndarray) -> tuple[
-    tuple[float, ...], tuple[float, ...], tuple[float, ...], tuple[float, ...]
-]:
-    """Pre-compute palette LAB components for scalar matching.
+def precompute_palette_lab(palette_linear: np.ndarray) -> np.ndarray:
+    """Pre-compute packed palette LAB components for scalar matching.
 
-    Call once before the error diffusion loop, then pass results to
-    _match_pixel_lch() for each pixel.
+    Call once before the error diffusion loop, then pass the result to
+    _match_pixel_lch() for each pixel. The single C-contiguous float32
+    array keeps the whole palette in one or two cache lines and lets the
+    compiled match loop autovectorize over contiguous rows.
 
     Args:
         palette_linear: Palette in linear RGB. Shape: (num_colors, 3)
 
     Returns:
-        (palette_L, palette_a, palette_b, palette_C) as tuples of floats
+        Packed float32 array, shape (num_colors, 4), columns [L, a, b, C]
+        where C is the precomputed chroma sqrt(a^2 + b^2)
     """
     lab = rgb_to_lab(palette_linear)
-    L = tuple(float(x) for x in lab[:, 0])
-    a = tuple(float(x) for x in lab[:, 1])
-    b = tuple(float(x) for x in lab[:, 2])
-    C = tuple(math.sqrt(float(ai) ** 2 + float(bi) ** 2) for ai, bi in zip(lab[:, 1], lab[:, 2]))
-    return L, a, b, C
+    packed = np.empty((lab.shape[0], 4), dtype=np.float32)
+    packed[:, :3] = lab
+    packed[:, 3] = np.sqrt(lab[:, 1] ** 2 + lab[:, 2] ** 2)
+    return packed
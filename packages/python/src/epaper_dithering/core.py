@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
 from PIL import Image
 
 from . import algorithms
@@ -12,9 +13,44 @@ from .palettes import ColorPalette, ColorScheme
 
 _LOGGER = logging.getLogger(__name__)
 
+# Error diffusion kernel for each diffusion DitherMode, built once at
+# import so per-call dispatch is a single dict lookup instead of a
+# branch cascade
+_ED_KERNELS = {
+    DitherMode.FLOYD_STEINBERG: algorithms.FLOYD_STEINBERG,
+    DitherMode.ATKINSON: algorithms.ATKINSON,
+    DitherMode.STUCKI: algorithms.STUCKI,
+    DitherMode.SIERRA: algorithms.SIERRA,
+    DitherMode.SIERRA_LITE: algorithms.SIERRA_LITE,
+    DitherMode.JARVIS_JUDICE_NINKE: algorithms.JARVIS_JUDICE_NINKE,
+    DitherMode.BURKES: algorithms.BURKES,
+}
+
+
+def _dither_indices(
+        image: Image.Image | np.ndarray,
+        color_scheme: ColorScheme | ColorPalette,
+        mode: DitherMode,
+        serpentine: bool,
+        tone_compression: float | str,
+) -> tuple[np.ndarray, algorithms._PaletteData]:
+    """Shared dispatch for dither_image and dither_image_array."""
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        scheme_name = color_scheme.name if isinstance(color_scheme, ColorScheme) else "custom"
+        _LOGGER.debug("Applying %s dithering for %s palette", mode.name, scheme_name)
+
+    if mode == DitherMode.NONE:
+        return algorithms._direct_palette_map_indices(image, color_scheme, tone_compression)
+    if mode == DitherMode.ORDERED:
+        return algorithms._ordered_dither_indices(image, color_scheme, tone_compression)
+    kernel = _ED_KERNELS.get(mode, algorithms.BURKES)
+    return algorithms._error_diffusion_indices(
+        image, color_scheme, kernel, serpentine, tone_compression,
+    )
+
 
 def dither_image(
-        image: Image.Image,
+        image: Image.Image | np.ndarray,
         color_scheme: ColorScheme | ColorPalette,
         mode: DitherMode = DitherMode.BURKES,
         serpentine: bool = True,
@@ -23,7 +59,8 @@ def dither_image(
     """Apply dithering to image for e-paper display.
 
     Args:
-        image: Input image (RGB or RGBA)
+        image: Input image (RGB or RGBA), or a pre-decoded (H, W, 3|4)
+            uint8 array — skips the PIL conversion for numpy pipelines
         color_scheme: Target display color scheme OR measured ColorPalette
         mode: Dithering algorithm (default: BURKES)
         serpentine: Use serpentine scanning for error diffusion (default: True).
@@ -37,27 +74,50 @@ def dither_image(
     Returns:
         Dithered palette image matching color scheme
     """
-    # Log color scheme name if available
-    scheme_name = color_scheme.name if isinstance(color_scheme, ColorScheme) else "custom"
-    _LOGGER.debug("Applying %s dithering for %s palette", mode.name, scheme_name)
-
-    tc = tone_compression
-    match mode:
-        case DitherMode.NONE:
-            return algorithms.direct_palette_map(image, color_scheme, tc)
-        case DitherMode.ORDERED:
-            return algorithms.ordered_dither(image, color_scheme, tc)
-        case DitherMode.FLOYD_STEINBERG:
-            return algorithms.floyd_steinberg_dither(image, color_scheme, serpentine, tc)
-        case DitherMode.ATKINSON:
-            return algorithms.atkinson_dither(image, color_scheme, serpentine, tc)
-        case DitherMode.STUCKI:
-            return algorithms.stucki_dither(image, color_scheme, serpentine, tc)
-        case DitherMode.SIERRA:
-            return algorithms.sierra_dither(image, color_scheme, serpentine, tc)
-        case DitherMode.SIERRA_LITE:
-            return algorithms.sierra_lite_dither(image, color_scheme, serpentine, tc)
-        case DitherMode.JARVIS_JUDICE_NINKE:
-            return algorithms.jarvis_judice_ninke_dither(image, color_scheme, serpentine, tc)
-        case _:  # BURKES or fallback
-            return algorithms.burkes_dither(image, color_scheme, serpentine, tc)
+    indices, palette = _dither_indices(image, color_scheme, mode, serpentine, tone_compression)
+    return algorithms._to_palette_image(indices, palette.flat_palette)
+
+
+def dither_image_array(
+        image: Image.Image | np.ndarray,
+        color_scheme: ColorScheme | ColorPalette,
+        mode: DitherMode = DitherMode.BURKES,
+        serpentine: bool = True,
+        tone_compression: float | str = "auto",
+) -> np.ndarray:
+    """Like dither_image, but return the raw palette-index array.
+
+    Batch pipelines that feed the result into further numpy processing
+    (panel encoders, GPU uploads, frame differs) don't need the PIL
+    wrapper — this skips the P-mode image assembly and hands back the
+    index buffer directly. Palette order matches
+    algorithms.get_palette_colors(color_scheme).
+
+    Args: same as dither_image.
+
+    Returns:
+        Palette index array, shape (H, W), dtype uint8
+    """
+    indices, _ = _dither_indices(image, color_scheme, mode, serpentine, tone_compression)
+    return indices
+
+
+def precompile(color_scheme: ColorScheme | ColorPalette) -> None:
+    """Warm up the compiled kernels and palette caches for a color scheme.
+
+    With numba installed, the first dither call per algorithm pays JIT
+    compilation (potentially seconds). Latency-sensitive applications can
+    call this once at startup — it runs every dithering mode over a tiny
+    image so production calls hit only compiled code and warm caches.
+    Without numba this just pre-fills the palette caches; either way it
+    is cheap to call more than once.
+
+    Args:
+        color_scheme: The scheme or palette production will dither against
+            (kernel compilation is shared across palettes of equal size,
+            but the palette caches are per palette)
+    """
+    tile = Image.new("RGB", (16, 16), (128, 128, 128))
+    for mode in DitherMode:
+        for serpentine in (False, True):
+            dither_image(tile, color_scheme, mode, serpentine=serpentine)
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ColorPalette:
     """Color palette for an e-paper display."""
     colors: dict[str, tuple[int, int, int]]  # name -> RGB tuple
@@ -112,10 +112,21 @@ class ColorScheme(Enum):
         Raises:
             ValueError: If value is invalid
         """
-        for scheme in cls:
-            if scheme.value == value:  # type: ignore[comparison-overlap]
-                return scheme
-        raise ValueError(f"Invalid color scheme value: {value}")
+        try:
+            return _SCHEME_BY_VALUE[value]
+        except KeyError:
+            raise ValueError(f"Invalid color scheme value: {value}") from None
+
+
+# Firmware value -> member lookup, built once at import. Enum's own
+# _value2member_map_ stays empty for this class (the custom __init__
+# rewrites _value_ after member registration), so from_value keeps its
+# own table instead of scanning the members per call. The annotation is
+# load-bearing: mypy types scheme.value as the declared tuple, but
+# __init__ narrows the runtime value to its int component.
+_SCHEME_BY_VALUE: dict[int, ColorScheme] = {
+    scheme.value: scheme for scheme in ColorScheme  # type: ignore[misc]
+}
 
 
 # ============================================================================
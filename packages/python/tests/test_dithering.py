@@ -11,20 +11,20 @@ class TestDitheringAlgorithms:
     """Test all dithering algorithms."""
 
     @pytest.mark.parametrize("mode", list(DitherMode))
-    def test_all_modes_produce_valid_output(self, small_test_image, mode):
+    def test_all_modes_produce_valid_output(self, cached_dither, mode):
         """Test each dithering mode produces valid palette image."""
-        result = dither_image(small_test_image, ColorScheme.BWR, mode)
+        result = cached_dither(ColorScheme.BWR, mode)
 
         assert result.mode == 'P', f"Output should be palette mode, got {result.mode}"
-        assert result.size == small_test_image.size, "Output size should match input"
+        assert result.size == (10, 10), "Output size should match input"
 
         palette = result.getpalette()
         assert palette is not None, "Output should have a palette"
 
     @pytest.mark.parametrize("scheme", list(ColorScheme))
-    def test_all_color_schemes(self, small_test_image, scheme):
+    def test_all_color_schemes(self, cached_dither, scheme):
         """Test each color scheme works correctly."""
-        result = dither_image(small_test_image, scheme, DitherMode.BURKES)
+        result = cached_dither(scheme, DitherMode.BURKES)
 
         assert result.mode == 'P'
         palette = result.getpalette()
@@ -49,14 +49,12 @@ class TestDitheringAlgorithms:
 
         No pixel should have an index >= the number of colors in the scheme.
         """
-        gradient = Image.new("RGB", (64, 64))
-        pixels = gradient.load()
-        for y in range(64):
-            for x in range(64):
-                r = int(x * 255 / 63)
-                g = int(y * 255 / 63)
-                b = 128
-                pixels[x, y] = (r, g, b)
+        ramp = (np.arange(64) * 255 / 63).astype(np.uint8)
+        rgb = np.empty((64, 64, 3), dtype=np.uint8)
+        rgb[..., 0] = ramp[np.newaxis, :]
+        rgb[..., 1] = ramp[:, np.newaxis]
+        rgb[..., 2] = 128
+        gradient = Image.fromarray(rgb)
 
         result = dither_image(gradient, scheme, DitherMode.FLOYD_STEINBERG)
         result_pixels = np.array(result)
@@ -70,10 +68,9 @@ class TestColorScience:
 
     def test_gamma_correction_improves_midtones(self):
         """Test that gamma correction prevents dark crushing in midtones."""
-        gradient = Image.new("RGB", (256, 64))
-        for x in range(256):
-            for y in range(64):
-                gradient.putpixel((x, y), (x, x, x))
+        ramp = np.arange(256, dtype=np.uint8)
+        rgb = np.repeat(np.broadcast_to(ramp, (64, 256))[..., np.newaxis], 3, axis=2)
+        gradient = Image.fromarray(rgb)
 
         result = dither_image(gradient, ColorScheme.GRAYSCALE_4, DitherMode.FLOYD_STEINBERG)
 
@@ -103,12 +100,9 @@ class TestColorScience:
 
     def test_serpentine_parameter_works(self):
         """Test serpentine parameter can be enabled/disabled."""
-        gradient = Image.new("RGB", (100, 100))
-        pixels = gradient.load()
-        for y in range(100):
-            for x in range(100):
-                gray_value = int(x * 255 / 99)
-                pixels[x, y] = (gray_value, gray_value, gray_value)
+        ramp = (np.arange(100) * 255 / 99).astype(np.uint8)
+        rgb = np.repeat(np.broadcast_to(ramp, (100, 100))[..., np.newaxis], 3, axis=2)
+        gradient = Image.fromarray(rgb)
 
         result_serpentine = dither_image(
             gradient, ColorScheme.MONO, DitherMode.FLOYD_STEINBERG, serpentine=True
@@ -120,9 +114,9 @@ class TestColorScience:
         assert result_serpentine.mode == 'P'
         assert result_raster.mode == 'P'
 
-        array_serpentine = np.array(result_serpentine)
-        array_raster = np.array(result_raster)
-        assert not np.array_equal(array_serpentine, array_raster), \
+        # tobytes() equality is one memcmp over the index buffers — no
+        # intermediate ndarray per image
+        assert result_serpentine.tobytes() != result_raster.tobytes(), \
             "Serpentine should produce different output than raster"
 
     def test_deterministic_output(self):
@@ -132,7 +126,7 @@ class TestColorScience:
         result1 = dither_image(img, ColorScheme.BWR, DitherMode.FLOYD_STEINBERG)
         result2 = dither_image(img, ColorScheme.BWR, DitherMode.FLOYD_STEINBERG)
 
-        assert np.array_equal(np.array(result1), np.array(result2)), \
+        assert result1.tobytes() == result2.tobytes(), \
             "Dithering should be deterministic"
 
     def test_ordered_dithering_uses_threshold_correctly(self):
@@ -140,38 +134,33 @@ class TestColorScience:
         gray = Image.new("RGB", (16, 16), (186, 186, 186))
         result = dither_image(gray, ColorScheme.MONO, DitherMode.ORDERED)
 
-        pixels = list(result.get_flattened_data())
+        # One bincount pass over the raw index buffer instead of
+        # materializing a boxed-int list and scanning it per value
+        counts = np.bincount(np.asarray(result).ravel(), minlength=2)
 
-        unique = set(pixels)
-        assert len(unique) == 2, f"Should use both black and white, got {unique}"
-        assert 0 in unique and 1 in unique
+        used = np.flatnonzero(counts)
+        assert used.tolist() == [0, 1], f"Should use both black and white, got {used.tolist()}"
 
-        black_count = pixels.count(0)
-        white_count = pixels.count(1)
+        black_count = int(counts[0])
+        white_count = int(counts[1])
         ratio = black_count / (black_count + white_count)
         assert 0.20 < ratio < 0.35, \
             f"Should be ~25% black with LAB matching, got ratio {ratio:.2f}"
 
-    def test_all_error_diffusion_with_serpentine(self):
+    @pytest.mark.parametrize("serpentine", [True, False])
+    @pytest.mark.parametrize("mode", [
+        DitherMode.FLOYD_STEINBERG,
+        DitherMode.BURKES,
+        DitherMode.ATKINSON,
+        DitherMode.STUCKI,
+        DitherMode.SIERRA,
+        DitherMode.SIERRA_LITE,
+        DitherMode.JARVIS_JUDICE_NINKE,
+    ])
+    def test_all_error_diffusion_with_serpentine(self, cached_dither, mode, serpentine):
         """Test all error diffusion algorithms accept serpentine parameter."""
-        img = Image.new("RGB", (20, 20), (100, 100, 100))
-
-        error_diffusion_modes = [
-            DitherMode.FLOYD_STEINBERG,
-            DitherMode.BURKES,
-            DitherMode.ATKINSON,
-            DitherMode.STUCKI,
-            DitherMode.SIERRA,
-            DitherMode.SIERRA_LITE,
-            DitherMode.JARVIS_JUDICE_NINKE,
-        ]
-
-        for mode in error_diffusion_modes:
-            result_true = dither_image(img, ColorScheme.MONO, mode, serpentine=True)
-            assert result_true.mode == 'P', f"{mode.name} should work with serpentine=True"
-
-            result_false = dither_image(img, ColorScheme.MONO, mode, serpentine=False)
-            assert result_false.mode == 'P', f"{mode.name} should work with serpentine=False"
+        result = cached_dither(ColorScheme.MONO, mode, serpentine)
+        assert result.mode == 'P', f"{mode.name} should work with serpentine={serpentine}"
 
 
 class TestToneCompression:
@@ -220,9 +209,9 @@ class TestToneCompression:
         result_tc1 = dither_image(img, ColorScheme.MONO, DitherMode.NONE, tone_compression=1.0)
         result_auto = dither_image(img, ColorScheme.MONO, DitherMode.NONE, tone_compression="auto")
 
-        assert np.array_equal(np.array(result_tc0), np.array(result_tc1)), \
+        assert result_tc0.tobytes() == result_tc1.tobytes(), \
             "Tone compression should have no effect on theoretical ColorScheme"
-        assert np.array_equal(np.array(result_tc0), np.array(result_auto)), \
+        assert result_tc0.tobytes() == result_auto.tobytes(), \
             "Auto tone compression should have no effect on theoretical ColorScheme"
 
     @pytest.mark.parametrize("mode", list(DitherMode))
@@ -241,15 +230,92 @@ class TestToneCompression:
         from epaper_dithering import SPECTRA_7_3_6COLOR
 
         # Use a gradient to see meaningful differences
-        gradient = Image.new("RGB", (50, 50))
-        pixels = gradient.load()
-        for y in range(50):
-            for x in range(50):
-                v = int(x * 255 / 49)
-                pixels[x, y] = (v, v, v)
+        ramp = (np.arange(50) * 255 / 49).astype(np.uint8)
+        rgb = np.repeat(np.broadcast_to(ramp, (50, 50))[..., np.newaxis], 3, axis=2)
+        gradient = Image.fromarray(rgb)
 
         result_off = dither_image(gradient, SPECTRA_7_3_6COLOR, DitherMode.FLOYD_STEINBERG, tone_compression=0.0)
         result_on = dither_image(gradient, SPECTRA_7_3_6COLOR, DitherMode.FLOYD_STEINBERG, tone_compression=1.0)
 
-        assert not np.array_equal(np.array(result_off), np.array(result_on)), \
+        assert result_off.tobytes() != result_on.tobytes(), \
             "Tone compression should produce different output than no compression"
+
+
+class TestBatchDitherer:
+    """Test the reusable batch dithering API."""
+
+    def test_matches_single_image_output(self, gradient_image):
+        """BatchDitherer should produce identical output to the per-image API."""
+        from epaper_dithering import BatchDitherer
+        from epaper_dithering.algorithms import floyd_steinberg_dither
+
+        ditherer = BatchDitherer(ColorScheme.BWR)
+        expected = floyd_steinberg_dither(gradient_image, ColorScheme.BWR)
+        result = ditherer.run(gradient_image)
+
+        assert result.tobytes() == expected.tobytes(), \
+            "Batch output should match the per-image API exactly"
+
+    def test_multiple_frames_reuse_state(self, small_test_image, gradient_image):
+        """Consecutive same-sized frames should each dither correctly."""
+        from epaper_dithering import BatchDitherer
+
+        frames = [small_test_image, gradient_image.resize(small_test_image.size)]
+        ditherer = BatchDitherer(ColorScheme.MONO, size=small_test_image.size)
+
+        for frame in frames:
+            result = ditherer.run(frame)
+            assert result.mode == 'P'
+            assert result.size == frame.size
+
+    def test_size_mismatch_raises(self, small_test_image):
+        """A frame of the wrong size should raise ValueError."""
+        from epaper_dithering import BatchDitherer
+
+        ditherer = BatchDitherer(ColorScheme.BWR, size=(100, 100))
+        with pytest.raises(ValueError, match="does not match"):
+            ditherer.run(small_test_image)
+
+
+class TestPrecompile:
+    """Test the kernel warm-up helper."""
+
+    def test_precompile_runs_for_scheme_and_palette(self):
+        """precompile should accept both schemes and measured palettes."""
+        from epaper_dithering import SPECTRA_7_3_6COLOR, precompile
+
+        precompile(ColorScheme.BWR)
+        precompile(SPECTRA_7_3_6COLOR)
+
+
+class TestDitherImageArray:
+    """Test the array-returning variant of dither_image."""
+
+    @pytest.mark.parametrize("mode", [DitherMode.NONE, DitherMode.ORDERED, DitherMode.FLOYD_STEINBERG])
+    def test_matches_image_variant(self, small_test_image, mode):
+        """Index array should equal the pixel data of the P-mode image."""
+        from epaper_dithering import dither_image_array
+
+        indices = dither_image_array(small_test_image, ColorScheme.BWR, mode)
+        expected = np.asarray(dither_image(small_test_image, ColorScheme.BWR, mode))
+
+        assert indices.dtype == np.uint8
+        assert np.array_equal(indices, expected)
+
+
+class TestNdarrayInput:
+    """Test passing pre-decoded numpy arrays instead of PIL images."""
+
+    def test_matches_pil_input(self, gradient_image):
+        """An (H, W, 3) uint8 array should dither identically to the image."""
+        arr = np.asarray(gradient_image)
+
+        from_pil = np.asarray(dither_image(gradient_image, ColorScheme.BWR))
+        from_arr = np.asarray(dither_image(arr, ColorScheme.BWR))
+
+        assert np.array_equal(from_pil, from_arr)
+
+    def test_rejects_wrong_dtype(self):
+        """Non-uint8 arrays should raise ValueError."""
+        with pytest.raises(ValueError, match="uint8"):
+            dither_image(np.zeros((8, 8, 3), dtype=np.float32), ColorScheme.BWR)
@@ -21,11 +21,14 @@ ALL_KERNELS = [
     JARVIS_JUDICE_NINKE,
 ]
 
+KERNEL_IDS = [kernel.name for kernel in ALL_KERNELS]
+KERNEL_IDS_WITH_ATKINSON = KERNEL_IDS + [ATKINSON.name]
+
 
 class TestKernelWeights:
     """Validate error diffusion kernel weight correctness."""
 
-    @pytest.mark.parametrize("kernel", ALL_KERNELS, ids=lambda k: k.name)
+    @pytest.mark.parametrize("kernel", ALL_KERNELS, ids=KERNEL_IDS)
     def test_weights_sum_to_divisor(self, kernel):
         """Kernel weights must sum to divisor for full error propagation.
 
@@ -49,13 +52,13 @@ class TestKernelWeights:
         assert weight_sum == 6, \
             f"Atkinson should propagate 6/8 of error, weights sum to {weight_sum}"
 
-    @pytest.mark.parametrize("kernel", ALL_KERNELS + [ATKINSON], ids=lambda k: k.name)
+    @pytest.mark.parametrize("kernel", ALL_KERNELS + [ATKINSON], ids=KERNEL_IDS_WITH_ATKINSON)
     def test_all_weights_positive(self, kernel):
         """All kernel weights must be positive."""
         for dx, dy, weight in kernel.offsets:
             assert weight > 0, f"{kernel.name}: weight at ({dx},{dy}) is {weight}"
 
-    @pytest.mark.parametrize("kernel", ALL_KERNELS + [ATKINSON], ids=lambda k: k.name)
+    @pytest.mark.parametrize("kernel", ALL_KERNELS + [ATKINSON], ids=KERNEL_IDS_WITH_ATKINSON)
     def test_offsets_are_forward_only(self, kernel):
         """Kernel offsets must only distribute to unprocessed pixels.
 
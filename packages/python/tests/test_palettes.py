@@ -1,9 +1,18 @@
 """Tests for palette definitions and firmware conventions."""
 
+import numpy as np
 import pytest
 from PIL import Image
 
-from epaper_dithering import ColorScheme, DitherMode, dither_image
+from epaper_dithering import (
+    HANSHOW_BWR,
+    MONO_4_26,
+    SPECTRA_7_3_6COLOR,
+    ColorPalette,
+    ColorScheme,
+    DitherMode,
+    dither_image,
+)
 
 
 class TestColorSchemes:
@@ -20,10 +29,12 @@ class TestColorSchemes:
 
     def test_palette_colors_valid(self):
         """Test all palette colors are valid RGB tuples."""
-        for scheme in ColorScheme:
-            for color in scheme.palette.colors.values():
-                assert len(color) == 3, "RGB tuple should have 3 values"
-                assert all(0 <= c <= 255 for c in color), "RGB values should be 0-255"
+        colors = np.array([
+            color for scheme in ColorScheme for color in scheme.palette.colors.values()
+        ])
+        assert colors.ndim == 2 and colors.shape[1] == 3, \
+            "RGB tuple should have 3 values"
+        assert ((colors >= 0) & (colors <= 255)).all(), "RGB values should be 0-255"
 
     def test_accent_color_defined(self):
         """Test each scheme has an accent color."""
@@ -73,8 +84,8 @@ class TestDitherMode:
             DitherMode.JARVIS_JUDICE_NINKE,
         ]
 
-        for mode in expected_modes:
-            assert mode in DitherMode
+        missing = set(expected_modes) - set(DitherMode)
+        assert not missing, f"missing modes: {missing}"
 
     def test_mode_values(self):
         """Test DitherMode values match expected integers."""
@@ -88,8 +99,6 @@ class TestMeasuredPaletteIntegration:
 
     def test_dithering_accepts_colorpalette(self, small_test_image):
         """Test ColorPalette accepted by dither_image."""
-        from epaper_dithering import ColorPalette
-
         measured = ColorPalette(
             colors={'black': (2, 2, 2), 'white': (179, 182, 171), 'red': (117, 10, 0)},
             accent='red'
@@ -106,8 +115,6 @@ class TestMeasuredPaletteIntegration:
 
     def test_predefined_measured_palettes_work(self, small_test_image):
         """Test exported measured palette constants."""
-        from epaper_dithering import HANSHOW_BWR, MONO_4_26, SPECTRA_7_3_6COLOR
-
         result = dither_image(small_test_image, SPECTRA_7_3_6COLOR, DitherMode.BURKES)
         assert result.mode == 'P'
 
@@ -121,15 +128,23 @@ class TestMeasuredPaletteIntegration:
 class TestPureColorMapping:
     """Test that pure palette colors map to themselves."""
 
-    @pytest.mark.parametrize("scheme", list(ColorScheme))
+    @pytest.mark.parametrize("scheme", list(ColorScheme), ids=[s.name for s in ColorScheme])
     def test_pure_colors_map_to_own_index(self, scheme):
-        """Each palette color should map to its own index with DitherMode.NONE."""
-        for idx, (name, rgb) in enumerate(scheme.palette.colors.items()):
-            img = Image.new("RGB", (4, 4), rgb)
-            result = dither_image(img, scheme, DitherMode.NONE)
-            pixels = list(result.get_flattened_data())
-            assert all(p == idx for p in pixels), \
-                f"{scheme.name}: {name} {rgb} should map to index {idx}, got {set(pixels)}"
+        """Each palette color should map to its own index with DitherMode.NONE.
+
+        DitherMode.NONE maps each pixel independently, so all colors of a
+        scheme can be checked with one dither call over an image whose
+        rows are the palette colors in index order.
+        """
+        rows = list(scheme.palette.colors.items())
+        buf = b"".join(bytes(rgb) * 4 for _, rgb in rows)
+        img = Image.frombytes("RGB", (4, len(rows)), buf)
+        result = dither_image(img, scheme, DitherMode.NONE)
+        indices = np.asarray(result)
+        for idx, (name, rgb) in enumerate(rows):
+            assert (indices[idx] == idx).all(), \
+                f"{scheme.name}: {name} {rgb} should map to index {idx}, " \
+                f"got {np.unique(indices[idx]).tolist()}"
 
 
 class TestSpectraNormalization:
@@ -141,9 +156,7 @@ class TestSpectraNormalization:
         Raw values from colors.txt, paper reference (215, 217, 218).
         Formula: normalized = round(raw * 255 / paper_channel)
         """
-        from epaper_dithering import SPECTRA_7_3_6COLOR
-
-        paper = (215, 217, 218)
+        paper = np.array([215, 217, 218])
         raw_colors = {
             'black': (22, 11, 30),
             'white': (156, 172, 175),
@@ -153,8 +166,10 @@ class TestSpectraNormalization:
             'green': (34, 70, 49),
         }
 
-        for name, raw in raw_colors.items():
-            expected = tuple(round(raw[c] * 255 / paper[c]) for c in range(3))
-            actual = SPECTRA_7_3_6COLOR.colors[name]
-            assert actual == expected, \
-                f"{name}: expected {expected} from normalization, got {actual}"
+        raw = np.array(list(raw_colors.values()))
+        expected = np.round(raw * 255 / paper).astype(int)
+        actual = np.array([SPECTRA_7_3_6COLOR.colors[name] for name in raw_colors])
+        np.testing.assert_array_equal(
+            actual, expected,
+            err_msg=f"normalization mismatch, color order: {list(raw_colors)}",
+        )